@@ -3,14 +3,10 @@
 import streamlit as st
 import datetime
 
-from data_fetching import (
-    get_inflacion, get_tasa_monetaria, get_reservas,
-    get_tipo_cambio, get_cny, get_merval, get_cedears
-)
-from plotting import (
-    plot_inflacion, plot_tasa_monetaria, plot_reservas,
-    plot_tipo_cambio, plot_cny, plot_merval, plot_cedears
-)
+import http_client
+import metrics
+from data_fetching import get_dashboard
+from frames import reporte_memoria
 
 # Configurar la página
 st.set_page_config(page_title="Monitor Financiero", layout="wide")
@@ -33,34 +29,70 @@ end_date = st.sidebar.date_input(
     max_value=today
 )
 
+max_puntos = st.sidebar.number_input(
+    "Máx. puntos por serie (0 = todos)", min_value=0, value=0, step=100,
+    help="Reduce las series largas con LTTB conservando su forma y el último valor."
+)
+frecuencia = st.sidebar.selectbox(
+    "Resolución de los gráficos", ["auto", "D", "W", "M", "Q"],
+    format_func={"auto": "Automática", "D": "Diaria", "W": "Semanal", "M": "Mensual", "Q": "Trimestral"}.get,
+    help="Automática usa el agregado más grueso que conserva el detalle del rango elegido."
+)
+mostrar_estadisticas = st.sidebar.checkbox(
+    "Mostrar estadísticas", value=False,
+    help="Inflación interanual, media móvil de 30 días del dólar y volatilidad del Merval."
+)
+mostrar_diagnostico = st.sidebar.checkbox("Diagnóstico de descargas", value=False)
+
 # Título principal
 st.title("Monitor Financiero de la Economía Argentina")
 
 # --- Cargar Datos ---
 with st.spinner('Descargando datos...'):
-    df_inflacion = get_inflacion(start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"))
-    df_tasa = get_tasa_monetaria(start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"))
-    df_reservas = get_reservas(start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"))
-    df_tc = get_tipo_cambio(start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"))
-    df_cny = get_cny(start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"))
-    df_merval = get_merval(start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"))
-    df_cedears = get_cedears(start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"))
+    datos, errores = get_dashboard(start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"))
+
+# Plotly se importa recién cuando hay datos para graficar, con el título ya en pantalla
+from plotting import (
+    plot_inflacion, plot_tasa_monetaria, plot_reservas,
+    plot_tipo_cambio, plot_cny, plot_merval, plot_cedears
+)
+
+# Estadísticas que se superponen en cada panel (ver estadisticas.py)
+ESTADISTICAS_PANEL = {
+    "inflacion": ["yoy_compuesta"],
+    "tipo_cambio": ["sma_30d"],
+    "cny": ["sma_30d"],
+    "merval": ["vol_20"],
+}
+
+def mostrar_panel(nombre, plot):
+    if nombre in errores:
+        st.error(f"No se pudieron cargar los datos de {nombre}: {errores[nombre]}")
+    elif datos[nombre].empty:
+        st.info(f"Sin datos de {nombre} para el período seleccionado.")
+    else:
+        st.plotly_chart(plot(
+            datos[nombre], max_puntos=max_puntos or None, frecuencia=frecuencia,
+            estadisticas=ESTADISTICAS_PANEL.get(nombre) if mostrar_estadisticas else None
+        ), use_container_width=True)
+        if "datos_al" in datos[nombre].attrs:
+            st.caption(f"Datos al {datos[nombre].attrs['datos_al'].strftime('%d/%m/%Y %H:%M')}")
 
 # --- Layout ---
 col1, col2, col3 = st.columns(3)
 
 with col1:
-    st.plotly_chart(plot_inflacion(df_inflacion), use_container_width=True)
-    st.plotly_chart(plot_tasa_monetaria(df_tasa), use_container_width=True)
+    mostrar_panel("inflacion", plot_inflacion)
+    mostrar_panel("tasa", plot_tasa_monetaria)
 
 with col2:
-    st.plotly_chart(plot_reservas(df_reservas), use_container_width=True)
-    st.plotly_chart(plot_tipo_cambio(df_tc), use_container_width=True)
-    st.plotly_chart(plot_cny(df_cny), use_container_width=True)
+    mostrar_panel("reservas", plot_reservas)
+    mostrar_panel("tipo_cambio", plot_tipo_cambio)
+    mostrar_panel("cny", plot_cny)
 
 with col3:
-    st.plotly_chart(plot_merval(df_merval), use_container_width=True)
-    st.plotly_chart(plot_cedears(df_cedears), use_container_width=True)
+    mostrar_panel("merval", plot_merval)
+    mostrar_panel("cedears", plot_cedears)
 
     st.markdown("""
     ### Comentarios y Análisis
@@ -71,6 +103,32 @@ with col3:
     """)
 
 
+# --- Diagnóstico ---
+if mostrar_diagnostico:
+    st.sidebar.subheader("Descargas por serie")
+    st.sidebar.dataframe([
+        {
+            "fuente": fila["fuente"],
+            "serie": fila["serie"],
+            "llamadas": fila["llamadas"],
+            "ms prom.": round(fila["ms_promedio"], 1),
+            "ms último": round(fila["ultimo_segundos"] * 1000, 1),
+            "KB": round(fila["bytes"] / 1024, 1),
+            "filas": fila["filas"],
+            "reintentos": fila["reintentos"],
+            "hits": fila["cache_hits"],
+            "misses": fila["cache_misses"],
+            "errores": fila["errores"],
+        }
+        for fila in metrics.resumen()
+    ], hide_index=True)
+    st.sidebar.subheader("Límites por host")
+    st.sidebar.dataframe(http_client.estado_limites(), hide_index=True)
+    st.sidebar.subheader("Memoria por serie")
+    st.sidebar.dataframe(reporte_memoria(datos), hide_index=True)
+    with st.sidebar.expander("Métricas (formato Prometheus)"):
+        st.code(metrics.texto_prometheus(), language="text")
+
 # Footer
 st.caption(f"Actualizado el {today.strftime('%d/%m/%Y')}")
 
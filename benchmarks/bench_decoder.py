@@ -0,0 +1,63 @@
+# benchmarks/bench_decoder.py
+#
+# Compara el aplanado con doble bucle de results[].detalle[] contra el
+# decodificador columnar de decoders.py.
+#
+#   python benchmarks/bench_decoder.py [años] [cotizaciones_por_día]
+
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from decoders import cotizaciones_a_frame
+
+
+def payload_sintetico(anios, por_dia):
+    rng = np.random.default_rng(0)
+    fechas = pd.bdate_range(end="2025-04-30", periods=int(anios * 261))
+    return [
+        {
+            "fecha": f.strftime("%Y-%m-%d"),
+            "detalle": [
+                {"codigoMoneda": "USD", "descripcion": "DOLAR E.E.U.U.", "tipoPase": 1.0,
+                 "tipoCotizacion": float(v)}
+                for v in 1000 + rng.normal(0, 5, por_dia)
+            ],
+        }
+        for f in fechas
+    ]
+
+
+def bucle(data):
+    registros = []
+    for d in data:
+        fecha = d["fecha"]
+        for cot in d["detalle"]:
+            registros.append({"fecha": fecha, "usd_oficial": cot["tipoCotizacion"]})
+    df = pd.DataFrame(registros)
+    df["fecha"] = pd.to_datetime(df["fecha"])
+    return df.groupby("fecha").mean(numeric_only=True).reset_index()
+
+
+def columnar(data):
+    return cotizaciones_a_frame(data, "usd_oficial")
+
+
+if __name__ == "__main__":
+    anios = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    por_dia = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    data = payload_sintetico(anios, por_dia)
+
+    pd.testing.assert_frame_equal(bucle(data), columnar(data), check_dtype=False)
+
+    repeticiones = 20
+    t_bucle = min(timeit.repeat(lambda: bucle(data), number=1, repeat=repeticiones))
+    t_columnar = min(timeit.repeat(lambda: columnar(data), number=1, repeat=repeticiones))
+    print(f"{len(data)} días x {por_dia} cotizaciones")
+    print(f"bucle:    {t_bucle * 1000:8.2f} ms")
+    print(f"columnar: {t_columnar * 1000:8.2f} ms")
+    print(f"speedup:  {t_bucle / t_columnar:8.1f}x")
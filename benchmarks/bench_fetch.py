@@ -0,0 +1,113 @@
+# benchmarks/bench_fetch.py
+#
+# Mide la latencia de cada get_* de data_fetching.py y de la carga completa
+# de app.py (get_dashboard) contra el stub local, sin tocar las APIs reales.
+# Cada caso se corre en frío (almacén y cachés vacíos) y en caliente. Yahoo se
+# pide al stub con cliente_chart, que reemplaza a yf.download.
+#
+#   python benchmarks/bench_fetch.py --latencia 0.05 --desde 2020-01-01 --json resultados.json
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from stub_server import StubServer
+
+
+def medir(funcion, repeticiones, preparar):
+    tiempos = []
+    for _ in range(repeticiones):
+        preparar()
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de data_fetching contra el stub local")
+    parser.add_argument("--latencia", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--tasa-error", type=float, default=0.0)
+    parser.add_argument("--cotizaciones-por-dia", type=int, default=1)
+    parser.add_argument("--max-concurrentes", type=int, default=0, help="el stub responde 429 por encima de este valor")
+    parser.add_argument("--fixtures")
+    parser.add_argument("--desde", default="2024-08-01")
+    parser.add_argument("--hasta", default=time.strftime("%Y-%m-%d"))
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--motor", choices=["auto", "aiohttp", "hilos"], default="auto",
+                        help="motor de http_async (HTTP_MOTOR)")
+    parser.add_argument("--json", help="archivo donde guardar los resultados")
+    args = parser.parse_args()
+
+    stub = StubServer(latencia=args.latencia, jitter=args.jitter, tasa_error=args.tasa_error,
+                      cotizaciones_por_dia=args.cotizaciones_por_dia, fixtures=args.fixtures,
+                      max_concurrentes=args.max_concurrentes)
+    url = stub.start()
+
+    # data_fetching lee las URLs al importarse
+    os.environ["BCRA_API_URL"] = url
+    os.environ["BLUELYTICS_API_URL"] = url
+    almacenes = tempfile.TemporaryDirectory(prefix="bench_store_")
+    os.environ["BCRA_STORE_DIR"] = almacenes.name
+    os.environ["HTTP_MOTOR"] = args.motor
+
+    import cliente_chart
+    import data_fetching
+    import http_async
+    import http_client
+    import series_store
+
+    data_fetching._descargar_cierres = cliente_chart.descargador(url)
+
+    def en_frio():
+        series_store.STORE_DIR = tempfile.mkdtemp(dir=almacenes.name)
+        data_fetching._cache_blue.invalidar()
+        data_fetching._cache_tablero.invalidar()
+        stub.reiniciar_contadores()
+
+    fechas = (args.desde, args.hasta)
+    casos = {
+        "get_inflacion": lambda: data_fetching.get_inflacion(*fechas),
+        "get_tasa_monetaria": lambda: data_fetching.get_tasa_monetaria(*fechas),
+        "get_reservas": lambda: data_fetching.get_reservas(*fechas),
+        "get_usd_oficial": lambda: data_fetching.get_usd_oficial(*fechas),
+        "get_usd_blue": lambda: data_fetching.get_usd_blue(*fechas),
+        "get_cny_oficial": lambda: data_fetching.get_cny_oficial(*fechas),
+        "get_tipo_cambio": lambda: data_fetching.get_tipo_cambio(*fechas),
+        "get_cny": lambda: data_fetching.get_cny(*fechas),
+        "get_merval": lambda: data_fetching.get_merval(*fechas),
+        "get_cedears": lambda: data_fetching.get_cedears(*fechas),
+        "get_panel (4 BCRA + 2)": lambda: data_fetching.get_panel([1, 6, 15, 27, "usd_oficial", "usd_blue"], *fechas),
+        "app.py (get_dashboard)": lambda: data_fetching.get_dashboard(*fechas),
+    }
+
+    resultados = []
+    print(f"Stub {url} | latencia {args.latencia}s | rango {args.desde} a {args.hasta} | motor {args.motor}")
+    print(f"{'caso':<26}{'frío ms':>10}{'caliente ms':>13}{'pedidos':>9}{'KB':>10}")
+    for nombre, funcion in casos.items():
+        frio = medir(funcion, args.repeticiones, en_frio)
+        pedidos, kb = stub.pedidos, stub.bytes_enviados / 1024
+        caliente = medir(funcion, args.repeticiones, stub.reiniciar_contadores)
+        resultados.append({"caso": nombre, "frio_ms": frio * 1000, "caliente_ms": caliente * 1000,
+                           "pedidos_frio": pedidos, "kb_frio": kb})
+        print(f"{nombre:<26}{frio * 1000:>10.1f}{caliente * 1000:>13.1f}{pedidos:>9}{kb:>10.1f}")
+
+    print(f"Motor de descargas: {'aiohttp' if http_async._aiohttp else 'hilos'}")
+    for fila in http_client.estado_limites():
+        print(f"Límite {fila['host']}: concurrencia {fila['concurrencia']}, {fila['limitados']} respuestas 429/503")
+    stub.stop()
+    almacenes.cleanup()
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"parametros": vars(args), "resultados": resultados}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
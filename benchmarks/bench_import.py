@@ -0,0 +1,75 @@
+# benchmarks/bench_import.py
+#
+# Mide el tiempo de arranque en frío: cada módulo se importa en un intérprete
+# nuevo (como un worker, un job de CLI o un contenedor recién creado) y se
+# reporta la mediana de varias corridas y los módulos más pesados según
+# python -X importtime.
+#
+#   python benchmarks/bench_import.py --repeticiones 5 --top 8 data_fetching plotting
+
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+MODULOS = ["data_fetching", "plotting", "prefetch", "series_store", "http_client"]
+
+_LINEA_IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)")
+
+
+def medir_importacion(modulo):
+    # Devuelve (ms de pared del import, {módulo: µs acumulados}) en un proceso limpio
+    codigo = (
+        "import time; inicio = time.perf_counter(); "
+        f"import {modulo}; print((time.perf_counter() - inicio) * 1000)"
+    )
+    proceso = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=RAIZ, capture_output=True, text=True, check=True,
+    )
+    acumulados = {}
+    for linea in proceso.stderr.splitlines():
+        coincidencia = _LINEA_IMPORTTIME.match(linea)
+        if coincidencia:
+            acumulados[coincidencia.group(4)] = int(coincidencia.group(2))
+    return float(proceso.stdout.strip().splitlines()[-1]), acumulados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiempo de importación en frío de los módulos del repo")
+    parser.add_argument("modulos", nargs="*", default=MODULOS)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5, help="dependencias más pesadas a listar por módulo")
+    parser.add_argument("--json", help="archivo donde guardar los resultados")
+    args = parser.parse_args()
+
+    resultados = []
+    print(f"{'módulo':<16}{'mediana ms':>12}{'mín ms':>10}   dependencias más pesadas")
+    for modulo in args.modulos:
+        tiempos, acumulados = [], {}
+        for _ in range(args.repeticiones):
+            ms, acumulados = medir_importacion(modulo)
+            tiempos.append(ms)
+        # Solo paquetes de primer nivel, sin el propio módulo
+        pesados = sorted(
+            ((nombre, us) for nombre, us in acumulados.items() if "." not in nombre and nombre != modulo),
+            key=lambda par: par[1], reverse=True,
+        )[:args.top]
+        resultados.append({
+            "modulo": modulo, "mediana_ms": statistics.median(tiempos), "min_ms": min(tiempos),
+            "dependencias": {nombre: us / 1000 for nombre, us in pesados},
+        })
+        detalle = ", ".join(f"{nombre} {us / 1000:.0f}" for nombre, us in pesados)
+        print(f"{modulo:<16}{statistics.median(tiempos):>12.1f}{min(tiempos):>10.1f}   {detalle}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"parametros": vars(args), "resultados": resultados}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
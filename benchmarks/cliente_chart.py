@@ -0,0 +1,44 @@
+# benchmarks/cliente_chart.py
+#
+# Cliente mínimo del endpoint v8/finance/chart de Yahoo (el mismo que consulta
+# yfinance), para correr data_fetching contra el stub local. No es parte de la
+# app: bench_fetch lo inyecta en lugar de data_fetching._descargar_cierres.
+
+import pandas as pd
+
+import http_async
+
+
+def pedidos(url, tickers, start_date, end_date):
+    # Un pedido por ticker; end_date exclusiva, como en yf.download
+    params = {
+        "period1": int(pd.Timestamp(start_date).timestamp()),
+        "period2": int(pd.Timestamp(end_date).timestamp()),
+        "interval": "1d",
+    }
+    return [(f"{url}/v8/finance/chart/{ticker}", params) for ticker in tickers]
+
+
+def cierres(tickers, respuestas):
+    # DataFrame de cierres con una columna por ticker, indexado por fecha
+    columnas = {}
+    for ticker, r in zip(tickers, respuestas):
+        if isinstance(r, Exception):
+            raise r
+        if r.status_code != 200:
+            raise Exception(f"Error al obtener {ticker} de Yahoo")
+        resultado = r.json()["chart"]["result"][0]
+        fechas = pd.to_datetime(resultado.get("timestamp", []), unit="s").normalize()
+        cierre = resultado["indicators"]["quote"][0].get("close", [])
+        columnas[ticker] = pd.Series(cierre, index=fechas, dtype=float)
+    df = pd.DataFrame(columnas, columns=list(tickers))
+    df.index.name = "Date"
+    return df
+
+
+def descargador(url):
+    # Reemplazo de data_fetching._descargar_cierres: los tickers de un lote se
+    # piden a la vez por el motor asíncrono
+    def descargar_cierres(tickers, start_date, end_date):
+        return cierres(tickers, http_async.get_varios(pedidos(url, tickers, start_date, end_date)))
+    return descargar_cierres
@@ -0,0 +1,247 @@
+# benchmarks/stub_server.py
+#
+# Servidor HTTP local que imita los endpoints usados por data_fetching.py:
+#
+#   /estadisticas/v3.0/monetarias[/{id}]                  (BCRA)
+#   /estadisticascambiarias/v1.0/Cotizaciones/{moneda}    (BCRA)
+#   /v2/evolution.json                                    (Bluelytics)
+#   /v8/finance/chart/{ticker}                            (Yahoo, camino de yfinance)
+#
+# Las respuestas salen de fixtures grabados (un .json por ruta en --fixtures,
+# ej. "v2_evolution.json") o se generan de forma determinística. La latencia,
+# el tamaño del payload, la tasa de errores y los pedidos simultáneos que
+# acepta antes de responder 429 son configurables.
+#
+#   python benchmarks/stub_server.py --puerto 8765 --latencia 0.08 --tasa-error 0.05
+
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+VARIABLES = {
+    1: "Reservas Internacionales del BCRA (en millones de dólares)",
+    6: "Tasa de Política Monetaria (en % n.a.)",
+    15: "Base monetaria - Total (en millones de pesos)",
+    27: "Inflación mensual (variación en %)",
+}
+
+
+class StubServer:
+    def __init__(self, puerto=0, latencia=0.0, jitter=0.0, tasa_error=0.0,
+                 cotizaciones_por_dia=1, inicio_historia="2011-01-01", fixtures=None, semilla=0,
+                 max_concurrentes=0):
+        self.latencia = latencia
+        self.jitter = jitter
+        self.tasa_error = tasa_error
+        self.cotizaciones_por_dia = cotizaciones_por_dia
+        self.inicio_historia = inicio_historia
+        self.fixtures = fixtures
+        self.max_concurrentes = max_concurrentes  # 0: sin límite
+        self.pedidos = 0
+        self.bytes_enviados = 0
+        self.limitados = 0
+        self._en_curso = 0
+        self._random = random.Random(semilla)
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, como los upstream reales
+
+            def do_GET(self):
+                stub._atender(self)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", puerto), Handler)
+        self._httpd.daemon_threads = True
+        self._hilo = None
+
+    @property
+    def url(self):
+        host, puerto = self._httpd.server_address[:2]
+        return f"http://{host}:{puerto}"
+
+    def start(self):
+        self._hilo = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._hilo.start()
+        return self.url
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def reiniciar_contadores(self):
+        with self._lock:
+            self.pedidos = 0
+            self.bytes_enviados = 0
+            self.limitados = 0
+
+    # --- Atención de pedidos ---
+
+    def _atender(self, handler):
+        partes = urlsplit(handler.path)
+        params = {k: v[0] for k, v in parse_qs(partes.query).items()}
+        with self._lock:
+            espera = self.latencia + self._random.uniform(0, self.jitter)
+            falla = self._random.random() < self.tasa_error
+            limitado = 0 < self.max_concurrentes <= self._en_curso
+            if limitado:
+                self.limitados += 1
+            else:
+                self._en_curso += 1
+
+        if limitado:
+            estado, cuerpo = 429, {"status": 429, "errorMessages": ["Demasiados pedidos (stub)"]}
+        else:
+            try:
+                time.sleep(espera)
+                if falla:
+                    estado, cuerpo = 503, {"status": 503, "errorMessages": ["Servicio no disponible (stub)"]}
+                else:
+                    estado, cuerpo = self._responder(partes.path, params)
+            finally:
+                with self._lock:
+                    self._en_curso -= 1
+
+        datos = json.dumps(cuerpo).encode("utf-8")
+        with self._lock:
+            self.pedidos += 1
+            self.bytes_enviados += len(datos)
+        handler.send_response(estado)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(datos)))
+        handler.end_headers()
+        handler.wfile.write(datos)
+
+    def _responder(self, ruta, params):
+        fixture = self._fixture(ruta)
+        if fixture is not None:
+            return 200, fixture
+
+        segmentos = [s for s in ruta.split("/") if s]
+        if segmentos[:3] == ["estadisticas", "v3.0", "monetarias"]:
+            if len(segmentos) == 3:
+                return 200, {"status": 200, "results": [
+                    {"idVariable": i, "cdSerie": i, "descripcion": d, "fecha": "2025-04-30", "valor": 1.0}
+                    for i, d in VARIABLES.items()
+                ]}
+            return self._variable(int(segmentos[3]), params)
+        if segmentos[:3] == ["estadisticascambiarias", "v1.0", "Cotizaciones"] and len(segmentos) == 4:
+            return self._cotizaciones(segmentos[3], params)
+        if segmentos == ["v2", "evolution.json"]:
+            return 200, self._evolution()
+        if segmentos[:3] == ["v8", "finance", "chart"] and len(segmentos) == 4:
+            return 200, self._chart(segmentos[3], params)
+        return 404, {"status": 404, "errorMessages": [f"Ruta desconocida: {ruta}"]}
+
+    def _fixture(self, ruta):
+        if not self.fixtures:
+            return None
+        archivo = os.path.join(self.fixtures, ruta.strip("/").replace("/", "_").replace(".json", "") + ".json")
+        if not os.path.exists(archivo):
+            return None
+        with open(archivo, encoding="utf-8") as f:
+            return json.load(f)
+
+    # --- Generadores sintéticos ---
+
+    @staticmethod
+    def _serie(clave, fechas, base, escala):
+        # Paseo aleatorio determinístico por clave y fecha
+        semilla = sum(map(ord, str(clave)))
+        rng = np.random.default_rng(semilla)
+        origen = pd.Timestamp("2000-01-01")
+        pasos = rng.normal(0, escala, (max(fechas) - origen).days + 1) if len(fechas) else []
+        nivel = base + np.cumsum(pasos)
+        return [float(abs(nivel[(f - origen).days])) for f in fechas]
+
+    def _variable(self, id_variable, params):
+        if id_variable not in VARIABLES:
+            return 404, {"status": 404, "errorMessages": [f"Variable {id_variable} inexistente"]}
+        try:
+            fechas = pd.bdate_range(params["desde"], params["hasta"])
+        except (KeyError, ValueError):
+            return 400, {"status": 400, "errorMessages": ["Fechas mal formateadas"]}
+        if id_variable == 27:
+            fechas = fechas[fechas.is_month_end | (fechas == fechas[-1])] if len(fechas) else fechas
+        valores = self._serie(id_variable, fechas, 1000.0 * id_variable, 5.0)
+        # Como la API: de la más reciente a la más antigua, paginado con limit (por
+        # defecto 1000, hasta 3000) y offset
+        limite = min(int(params.get("limit", 1000)), 3000)
+        offset = int(params.get("offset", 0))
+        resultados = [
+            {"idVariable": id_variable, "fecha": f.strftime("%Y-%m-%d"), "valor": v}
+            for f, v in zip(fechas[::-1], valores[::-1])
+        ]
+        return 200, {
+            "status": 200,
+            "metadata": {"resultset": {"count": len(resultados), "offset": offset, "limit": limite}},
+            "results": resultados[offset:offset + limite],
+        }
+
+    def _cotizaciones(self, moneda, params):
+        fechas = pd.bdate_range(params["fechadesde"], params["fechahasta"])[::-1]
+        fechas = fechas[:int(params.get("limit", 1000))]
+        valores = self._serie(moneda, fechas, 900.0, 3.0)
+        return 200, {"status": 200, "metadata": {"resultset": {"count": len(fechas)}}, "results": [
+            {"fecha": f.strftime("%Y-%m-%d"), "detalle": [
+                {"codigoMoneda": moneda, "descripcion": moneda, "tipoPase": 1.0,
+                 "tipoCotizacion": v * (1 + 0.001 * i)}
+                for i in range(self.cotizaciones_por_dia)
+            ]}
+            for f, v in zip(fechas, valores)
+        ]}
+
+    def _evolution(self):
+        fechas = pd.date_range(self.inicio_historia, pd.Timestamp.today().normalize())[::-1]
+        registros = []
+        for fuente, base in (("Oficial", 800.0), ("Blue", 1100.0)):
+            for f, v in zip(fechas, self._serie(fuente, fechas, base, 4.0)):
+                registros.append({"date": f.strftime("%Y-%m-%d"), "source": fuente,
+                                  "value_sell": v + 10, "value_buy": v - 10})
+        return registros
+
+    def _chart(self, ticker, params):
+        desde = pd.Timestamp(int(params.get("period1", 0)), unit="s")
+        hasta = pd.Timestamp(int(params.get("period2", time.time())), unit="s")
+        fechas = pd.bdate_range(desde.normalize(), hasta.normalize())
+        cierres = self._serie(ticker, fechas, 1000.0, 10.0)
+        return {"chart": {"error": None, "result": [{
+            "meta": {"symbol": ticker, "currency": "ARS"},
+            "timestamp": [int(f.timestamp()) + 14 * 3600 for f in fechas],
+            "indicators": {"quote": [{"close": cierres}]},
+        }]}}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stub local de BCRA, Bluelytics y Yahoo")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--latencia", type=float, default=0.0, help="segundos por respuesta")
+    parser.add_argument("--jitter", type=float, default=0.0, help="segundos extra aleatorios")
+    parser.add_argument("--tasa-error", type=float, default=0.0, help="fracción de respuestas 503")
+    parser.add_argument("--cotizaciones-por-dia", type=int, default=1)
+    parser.add_argument("--inicio-historia", default="2011-01-01", help="inicio de evolution.json")
+    parser.add_argument("--fixtures", help="directorio con respuestas grabadas")
+    parser.add_argument("--max-concurrentes", type=int, default=0, help="pedidos simultáneos antes de responder 429")
+    args = parser.parse_args()
+
+    stub = StubServer(args.puerto, args.latencia, args.jitter, args.tasa_error,
+                      args.cotizaciones_por_dia, args.inicio_historia, args.fixtures,
+                      max_concurrentes=args.max_concurrentes)
+    print(f"Stub escuchando en {stub.url}")
+    print(f"  BCRA_API_URL={stub.url} BLUELYTICS_API_URL={stub.url} (Yahoo: benchmarks/cliente_chart.py)")
+    try:
+        stub._httpd.serve_forever()
+    except KeyboardInterrupt:
+        stub.stop()
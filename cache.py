@@ -0,0 +1,115 @@
+# cache.py
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# --- Caché en memoria compartida por el proceso ---
+# Entradas con vencimiento (TTL) y coalescencia de pedidos: si varios hilos
+# piden la misma clave a la vez, solo uno descarga y el resto espera el resultado.
+# El tamaño está acotado: pasado max_entradas se descarta la menos usada
+# recientemente (LRU), y las entradas vencidas que nadie leyó en `inactividad`
+# segundos se descartan aunque haya lugar.
+
+CACHE_MAX_ENTRADAS = int(os.environ.get("CACHE_MAX_ENTRADAS", 128))
+CACHE_INACTIVIDAD = int(os.environ.get("CACHE_INACTIVIDAD", 3600))
+
+
+class TTLCache:
+    # revalidar=True activa stale-while-revalidate: una entrada vencida se devuelve
+    # igual y se refresca en un hilo de fondo, así ningún pedido espera a la fuente
+    # una vez que la caché tiene datos.
+    def __init__(self, ttl, revalidar=False, max_entradas=CACHE_MAX_ENTRADAS, inactividad=CACHE_INACTIVIDAD):
+        self.ttl = ttl
+        self.revalidar = revalidar
+        self.max_entradas = max_entradas
+        self.inactividad = inactividad
+        self._datos = OrderedDict()  # clave -> (valor, momento de carga, último uso), de menos a más usada
+        self._en_vuelo = {}          # clave -> Future de la carga en curso
+        self._lock = threading.Lock()
+
+    def _purgar(self, ahora):
+        # Con el lock tomado
+        for clave in [
+            clave for clave, (_, cargado, uso) in self._datos.items()
+            if ahora - cargado >= self.ttl and ahora - uso >= self.inactividad
+        ]:
+            del self._datos[clave]
+        while len(self._datos) > self.max_entradas:
+            self._datos.popitem(last=False)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._datos)
+
+    def get_or_load(self, clave, cargar):
+        with self._lock:
+            ahora = time.time()
+            self._purgar(ahora)
+            entrada = self._datos.get(clave)
+            if entrada is not None:
+                vigente = ahora - entrada[1] < self.ttl
+                if not vigente and self.revalidar and clave not in self._en_vuelo:
+                    vuelo = Future()
+                    self._en_vuelo[clave] = vuelo
+                    threading.Thread(target=self._revalidar, args=(clave, cargar, vuelo), daemon=True).start()
+                if vigente or self.revalidar:
+                    self._datos[clave] = (entrada[0], entrada[1], ahora)
+                    self._datos.move_to_end(clave)
+                    metrics.registrar_cache(True)
+                    return entrada[0]
+            vuelo = self._en_vuelo.get(clave)
+            lider = vuelo is None
+            if lider:
+                vuelo = Future()
+                self._en_vuelo[clave] = vuelo
+        # Esperar una descarga en curso cuenta como acierto
+        metrics.registrar_cache(not lider)
+
+        if not lider:
+            return vuelo.result()
+        return self._cargar(clave, cargar, vuelo)
+
+    def _cargar(self, clave, cargar, vuelo):
+        try:
+            valor = cargar()
+        except Exception as e:
+            vuelo.set_exception(e)
+            raise
+        else:
+            vuelo.set_result(valor)
+            with self._lock:
+                ahora = time.time()
+                self._datos[clave] = (valor, ahora, ahora)
+                self._datos.move_to_end(clave)
+                self._purgar(ahora)
+            return valor
+        finally:
+            with self._lock:
+                self._en_vuelo.pop(clave, None)
+
+    def _revalidar(self, clave, cargar, vuelo):
+        # Si el refresco falla se sigue sirviendo el valor anterior y se reintenta en el próximo pedido
+        try:
+            self._cargar(clave, cargar, vuelo)
+        except Exception as e:
+            logger.warning("No se pudo revalidar %r: %s", clave, e)
+
+    def cargado_en(self, clave):
+        with self._lock:
+            entrada = self._datos.get(clave)
+        return entrada[1] if entrada is not None else None
+
+    def invalidar(self, clave=None):
+        with self._lock:
+            if clave is None:
+                self._datos.clear()
+            else:
+                self._datos.pop(clave, None)
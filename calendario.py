@@ -0,0 +1,136 @@
+# calendario.py
+
+import datetime
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# --- Calendario de días hábiles de Argentina ---
+# Feriados nacionales inamovibles, trasladables (Ley 27.399) y los que dependen
+# de Pascua (carnaval, jueves y viernes santo). Los feriados puente que se
+# decretan cada año se agregan con FERIADOS_EXTRA="2024-04-01,2024-06-21,...".
+
+FERIADOS_INAMOVIBLES = [
+    (1, 1),    # Año nuevo
+    (3, 24),   # Día de la Memoria
+    (4, 2),    # Malvinas
+    (5, 1),    # Día del Trabajador
+    (5, 25),   # Revolución de Mayo
+    (6, 20),   # Belgrano
+    (7, 9),    # Independencia
+    (12, 8),   # Inmaculada Concepción
+    (12, 25),  # Navidad
+]
+
+# Martes y miércoles pasan al lunes anterior; jueves y viernes al lunes siguiente
+FERIADOS_TRASLADABLES = [
+    (6, 17),   # Güemes
+    (8, 17),   # San Martín
+    (10, 12),  # Diversidad Cultural
+    (11, 20),  # Soberanía Nacional
+]
+
+FERIADOS_EXTRA = [
+    datetime.date.fromisoformat(f.strip())
+    for f in os.environ.get("FERIADOS_EXTRA", "").split(",") if f.strip()
+]
+
+
+def pascua(anio):
+    # Domingo de Pascua gregoriano (algoritmo anónimo, Meeus/Jones/Butcher)
+    a = anio % 19
+    b, c = divmod(anio, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    mes, dia = divmod(h + l - 7 * m + 114, 31)
+    return datetime.date(anio, mes, dia + 1)
+
+
+def _trasladar(fecha):
+    dia_semana = fecha.weekday()
+    if dia_semana in (1, 2):
+        return fecha - datetime.timedelta(days=dia_semana)
+    if dia_semana in (3, 4):
+        return fecha + datetime.timedelta(days=7 - dia_semana)
+    return fecha
+
+
+@lru_cache(maxsize=None)
+def feriados(anio):
+    domingo = pascua(anio)
+    dias = {datetime.date(anio, mes, dia) for mes, dia in FERIADOS_INAMOVIBLES}
+    dias |= {_trasladar(datetime.date(anio, mes, dia)) for mes, dia in FERIADOS_TRASLADABLES}
+    dias |= {domingo - datetime.timedelta(days=n) for n in (48, 47, 3, 2)}
+    dias |= {f for f in FERIADOS_EXTRA if f.year == anio}
+    return frozenset(dias)
+
+
+@lru_cache(maxsize=None)
+def _habiles_anio(anio):
+    return pd.bdate_range(f"{anio}-01-01", f"{anio}-12-31", freq="C", holidays=sorted(feriados(anio)))
+
+
+def dias_habiles(desde, hasta):
+    # DatetimeIndex de días hábiles entre desde y hasta (inclusive); cada año se calcula una sola vez
+    desde, hasta = pd.Timestamp(desde), pd.Timestamp(hasta)
+    if desde > hasta:
+        return pd.DatetimeIndex([], name="fecha")
+    indice = _habiles_anio(desde.year)
+    for anio in range(desde.year + 1, hasta.year + 1):
+        indice = indice.append(_habiles_anio(anio))
+    indice = indice[indice.slice_indexer(desde, hasta)]
+    indice.name = "fecha"
+    return indice
+
+
+def es_habil(fecha):
+    fecha = pd.Timestamp(fecha).date()
+    return fecha.weekday() < 5 and fecha not in feriados(fecha.year)
+
+
+# --- Alineación as-of ---
+
+
+def a_serie(df, columna):
+    # Columna de un frame con "fecha" como Series indexada por fecha
+    return df.set_index("fecha")[columna]
+
+
+def alinear(series, desde=None, hasta=None, limite_dias=None):
+    # series: {nombre: Series indexada por fecha}. Devuelve un DataFrame indexado
+    # por los días hábiles del rango con el último valor conocido de cada serie
+    # a esa fecha (join as-of hacia atrás). limite_dias descarta valores más
+    # viejos que esa cantidad de días. Sin desde/hasta se usa el rango cubierto.
+    limpias = {}
+    for nombre, serie in series.items():
+        serie = serie.dropna()
+        serie = serie[~serie.index.duplicated(keep="last")]
+        if not serie.index.is_monotonic_increasing:
+            serie = serie.sort_index()
+        limpias[nombre] = serie
+
+    con_datos = [s for s in limpias.values() if len(s)]
+    if desde is None:
+        desde = min((s.index[0] for s in con_datos), default=None)
+    if hasta is None:
+        hasta = max((s.index[-1] for s in con_datos), default=None)
+    if desde is None or hasta is None:
+        indice = pd.DatetimeIndex([], name="fecha")
+    else:
+        indice = dias_habiles(desde, hasta)
+
+    tolerancia = pd.Timedelta(days=limite_dias) if limite_dias is not None else None
+    # Cada reindex es una búsqueda binaria vectorizada sobre el índice ordenado
+    columnas = {
+        nombre: serie.reindex(indice, method="ffill", tolerance=tolerancia).to_numpy() if len(serie)
+        else np.full(len(indice), np.nan, dtype="float32")
+        for nombre, serie in limpias.items()
+    }
+    return pd.DataFrame(columnas, index=indice)
@@ -0,0 +1,102 @@
+# catalogo.py
+
+import json
+import logging
+import os
+import time
+
+import http_client
+import series_store
+from cache import TTLCache
+from data_fetching import BCRA_API_URL, BCRAError
+
+logger = logging.getLogger(__name__)
+
+# --- Catálogo de variables del BCRA ---
+# El listado de /estadisticas/v3.0/monetarias cambia muy de vez en cuando: se
+# guarda en disco junto al almacén de series, se sirve desde memoria con
+# índices por id y por descripción, y al vencer CATALOGO_TTL se refresca en
+# segundo plano mientras se sigue sirviendo la versión anterior.
+
+CATALOGO_TTL = int(os.environ.get("CATALOGO_TTL", 24 * 3600))
+
+_cache_catalogo = TTLCache(CATALOGO_TTL, revalidar=True)
+
+
+class Catalogo:
+    def __init__(self, variables, actualizado):
+        self.variables = sorted(variables, key=lambda v: v["descripcion"])
+        self.actualizado = actualizado
+        self.por_id = {v["idVariable"]: v for v in self.variables}
+        self.por_descripcion = {v["descripcion"]: v for v in self.variables}
+        # Listo para un selectbox, en orden alfabético
+        self.descripciones = [v["descripcion"] for v in self.variables]
+
+    def __len__(self):
+        return len(self.variables)
+
+    def id_de(self, descripcion):
+        return self.por_descripcion[descripcion]["idVariable"]
+
+    def descripcion(self, id_variable, defecto=None):
+        variable = self.por_id.get(id_variable)
+        if variable is None:
+            return defecto if defecto is not None else f"Variable {id_variable}"
+        return variable["descripcion"]
+
+
+def _ruta():
+    return os.path.join(series_store.STORE_DIR, "catalogo.json")
+
+
+def _leer_disco():
+    try:
+        with open(_ruta(), encoding="utf-8") as f:
+            guardado = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return Catalogo(guardado["variables"], guardado["actualizado"])
+
+
+def _descargar():
+    response = http_client.get(f"{BCRA_API_URL}/estadisticas/v3.0/monetarias")
+    if response.status_code != 200:
+        raise BCRAError(f"Error {response.status_code}: no se pudo obtener el catálogo de variables del BCRA.")
+    # Solo los campos que usa el catálogo, no el último valor de cada variable
+    variables = [
+        {"idVariable": v["idVariable"], "descripcion": v["descripcion"]}
+        for v in response.json().get("results", [])
+    ]
+    catalogo = Catalogo(variables, time.time())
+    os.makedirs(series_store.STORE_DIR, exist_ok=True)
+    temporal = f"{_ruta()}.{os.getpid()}.tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump({"actualizado": catalogo.actualizado, "variables": catalogo.variables}, f, ensure_ascii=False)
+    os.replace(temporal, _ruta())
+    return catalogo
+
+
+def _cargar():
+    # Disco si está vigente (ej. lo actualizó prefetch); si no, la API. Si la
+    # API falla se sirve la copia en disco aunque esté vencida.
+    guardado = _leer_disco()
+    if guardado is not None and time.time() - guardado.actualizado < CATALOGO_TTL:
+        return guardado
+    try:
+        return _descargar()
+    except Exception as e:
+        if guardado is None:
+            raise
+        logger.warning("Catálogo servido desde disco (%s): %s", time.ctime(guardado.actualizado), e)
+        return guardado
+
+
+def get_catalogo():
+    return _cache_catalogo.get_or_load("monetarias", _cargar)
+
+
+def actualizar():
+    # Descarga el catálogo ahora y reemplaza el de memoria
+    catalogo = _descargar()
+    _cache_catalogo.invalidar()
+    return catalogo
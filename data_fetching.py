@@ -1,86 +1,297 @@
 # data_fetching.py
 
-import requests
 import pandas as pd
-import yfinance as yf
-import streamlit as st
 import datetime
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import http_async
+import http_client
+import indicadores
+import metrics
+import rollups
+import series_store
+from cache import TTLCache
+from calendario import a_serie, alinear, dias_habiles
+from decoders import cotizaciones_a_frame
+from frames import compactar
+
+# La capa de datos no depende de Streamlit: los errores se propagan como
+# excepciones y los avisos van al log, así se puede usar desde prefetch.py,
+# benchmarks o scripts sin levantar la app. yfinance se importa recién al usarlo.
+logger = logging.getLogger(__name__)
 
 # --- Funciones para obtención de datos ---
 
-def get_bcra_variable(id_variable, start_date, end_date):
-    url = f"https://api.bcra.gob.ar/estadisticas/v3.0/monetarias/{id_variable}?desde={start_date}&hasta={end_date}"
+# URLs base de las fuentes; se pueden apuntar a un servidor local (benchmarks/stub_server.py)
+BCRA_API_URL = os.environ.get("BCRA_API_URL", "https://api.bcra.gob.ar")
+BLUELYTICS_API_URL = os.environ.get("BLUELYTICS_API_URL", "https://api.bluelytics.com.ar")
+
+# Vigencia en segundos de la serie de Bluelytics en memoria
+BLUELYTICS_TTL = int(os.environ.get("BLUELYTICS_TTL", 900))
+_cache_blue = TTLCache(BLUELYTICS_TTL, revalidar=True)
+
+# Vigencia de cada serie del tablero; vencida se sirve igual y se refresca en segundo plano.
+# Hay una entrada por (serie, rango de fechas): se retienen a lo sumo DASHBOARD_MAX_ENTRADAS.
+DASHBOARD_TTL = int(os.environ.get("DASHBOARD_TTL", 300))
+DASHBOARD_MAX_ENTRADAS = int(os.environ.get("DASHBOARD_MAX_ENTRADAS", 70))
+_cache_tablero = TTLCache(DASHBOARD_TTL, revalidar=True, max_entradas=DASHBOARD_MAX_ENTRADAS)
+
+# Cotizaciones: días por pedido (el endpoint devuelve hasta 1000 resultados).
+# La tasa y los pedidos simultáneos por host los regula http_client.
+COTIZACIONES_DIAS_POR_TRAMO = int(os.environ.get("COTIZACIONES_DIAS_POR_TRAMO", 365))
+
+# Yahoo: tickers por pedido, días por tramo e hilos de yfinance
+YAHOO_LOTE = int(os.environ.get("YAHOO_LOTE", 20))
+YAHOO_DIAS_POR_TRAMO = int(os.environ.get("YAHOO_DIAS_POR_TRAMO", 730))
+YAHOO_MAX_WORKERS = int(os.environ.get("YAHOO_MAX_WORKERS", 4))
+
+# Universo de acciones/CEDEARs del panel: CEDEARS_ARCHIVO (CSV con columnas
+# ticker,nombre) o CEDEARS ("YPFD.BA:YPF,GGAL.BA:Galicia,..."); por defecto los cuatro históricos
+CEDEARS_POR_DEFECTO = {
+    "YPFD.BA": "YPF",
+    "GGAL.BA": "Galicia",
+    "BMA.BA": "Banco Macro",
+    "MELI.BA": "MercadoLibre",
+}
+
+def cargar_universo(archivo=None, texto=None):
+    if archivo:
+        df = pd.read_csv(archivo, dtype=str).dropna(subset=["ticker"])
+        nombres = df["nombre"] if "nombre" in df.columns else df["ticker"]
+        return dict(zip(df["ticker"].str.strip(), nombres.fillna(df["ticker"]).str.strip()))
+    if texto:
+        universo = {}
+        for item in filter(None, (i.strip() for i in texto.split(","))):
+            ticker, _, nombre = item.partition(":")
+            universo[ticker.strip()] = nombre.strip() or ticker.strip()
+        return universo
+    return dict(CEDEARS_POR_DEFECTO)
+
+CEDEARS = cargar_universo(os.environ.get("CEDEARS_ARCHIVO"), os.environ.get("CEDEARS"))
+
+# Variables monetarias: el endpoint pagina (limit hasta 3000, de la fecha más
+# reciente a la más antigua). Se pide por tramos de días que entran en una
+# página y, si metadata.resultset.count indica más resultados, se sigue con offset.
+BCRA_LIMITE = 3000
+BCRA_DIAS_POR_TRAMO = int(os.environ.get("BCRA_DIAS_POR_TRAMO", 2500))
+
+class BCRAError(Exception):
+    pass
+
+def _pedido_bcra_variable(id_variable, start_date, end_date, offset=0):
+    url = f"{BCRA_API_URL}/estadisticas/v3.0/monetarias/{id_variable}"
+    return url, {"desde": start_date, "hasta": end_date, "limit": BCRA_LIMITE, "offset": offset}
+
+def _resultados_bcra_variable(id_variable, response):
+    # (resultados de la página, total que informa metadata.resultset.count)
+    if isinstance(response, Exception):
+        raise response
+    if response.status_code == 200:
+        datos = response.json()
+        resultados = datos.get("results", [])
+        total = datos.get("metadata", {}).get("resultset", {}).get("count", len(resultados))
+        return resultados, total
+    elif response.status_code == 400:
+        raise BCRAError(f"Error 400: Fechas mal formateadas en la consulta al BCRA.")
+    elif response.status_code == 404:
+        raise BCRAError(f"Error 404: Variable ID {id_variable} no encontrada en el BCRA.")
+    elif response.status_code == 429:
+        raise BCRAError("Error 429: la API del BCRA está limitando los pedidos. Intente nuevamente en unos minutos.")
+    else:
+        raise BCRAError(f"Error {response.status_code}: Problema en la API del BCRA. Intente nuevamente más tarde.")
+
+def _tramo_bcra_variable(id_variable, desde, hasta, response):
+    # Resultados completos de un tramo: si no entraron en la primera página se
+    # piden las siguientes con offset
+    resultados, total = _resultados_bcra_variable(id_variable, response)
+    resultados = list(resultados)
+    while len(resultados) < total:
+        url, params = _pedido_bcra_variable(id_variable, desde, hasta, offset=len(resultados))
+        pagina, _ = _resultados_bcra_variable(id_variable, http_client.get(url, params=params))
+        if not pagina:
+            raise BCRAError(f"Respuesta incompleta del BCRA para la variable {id_variable} ({len(resultados)} de {total}).")
+        resultados.extend(pagina)
+    return resultados
+
+def _frame_bcra_variable(resultados):
+    df = pd.DataFrame(resultados, columns=["fecha", "valor"])
+    df["fecha"] = pd.to_datetime(df["fecha"])
+    df["valor"] = pd.to_numeric(df["valor"], errors="coerce")
+    return df.sort_values("fecha").reset_index(drop=True)
+
+def _descargar_bcra_variables(rangos):
+    # rangos: [(id_variable, desde, hasta)]. Cada rango se parte en tramos de
+    # BCRA_DIAS_POR_TRAMO días que se piden todos a la vez; devuelve, por rango,
+    # el DataFrame completo o la excepción del primer tramo que falló.
+    tramos = [
+        (i, id_variable, tramo)
+        for i, (id_variable, desde, hasta) in enumerate(rangos)
+        for tramo in _tramos_fechas(desde, hasta, BCRA_DIAS_POR_TRAMO)
+    ]
+    respuestas = http_async.get_varios([_pedido_bcra_variable(id_variable, *tramo) for _, id_variable, tramo in tramos])
+    partes = [[] for _ in rangos]
+    for (i, id_variable, tramo), response in zip(tramos, respuestas):
+        if isinstance(partes[i], Exception):
+            continue
+        try:
+            partes[i].extend(_tramo_bcra_variable(id_variable, *tramo, response))
+        except Exception as e:
+            partes[i] = e
+    return [parte if isinstance(parte, Exception) else _frame_bcra_variable(parte) for parte in partes]
+
+def _descargar_bcra_variable(id_variable, start_date, end_date):
+    df = _descargar_bcra_variables([(id_variable, start_date, end_date)])[0]
+    if isinstance(df, Exception):
+        raise df
+    return df
+
+def _precargar_bcra_variables(ids, start_date, end_date, refresco=None):
+    # Descarga a la vez los rangos faltantes de varias variables y los guarda
+    # en el almacén. Un rango se guarda solo si llegaron todos sus tramos; lo
+    # que falle se ignora: get_bcra_variable lo vuelve a pedir y aplica su
+    # manejo de errores.
+    pendientes = [
+        (id_variable, desde, hasta)
+        for id_variable in ids
+        for desde, hasta in series_store.rangos_faltantes(f"bcra_{id_variable}", start_date, end_date, refresco)
+    ]
+    for (id_variable, desde, hasta), df in zip(pendientes, _descargar_bcra_variables(pendientes)):
+        if not isinstance(df, Exception):
+            _guardar(f"bcra_{id_variable}", df, desde, hasta)
+
+def _guardar(clave, df, desde, hasta):
+    # Guarda en el almacén y pone al día los agregados por período de la serie
+    series_store.guardar(clave, df, desde, hasta)
+    rollups.actualizar(clave)
+
+def _leer_almacenada(clave, start_date, end_date):
+    # attrs["serie"] indica de qué serie del almacén sale el frame (ver rollups.agregado_almacenado)
+    df = compactar(series_store.leer(clave, start_date, end_date))
+    df.attrs["serie"] = clave
+    return df
+
+def _serie_almacenada(clave, descargar, start_date, end_date, refresco=None):
+    # Lee primero del almacén local y solo pide a la fuente las fechas que faltan.
+    # descargar(desde, hasta) devuelve un DataFrame con columnas fecha/valor.
+    # refresco: segundos tras los que se vuelve a consultar la cola (ver
+    # series_store.rangos_faltantes); 0 la consulta siempre.
+    faltantes = series_store.rangos_faltantes(clave, start_date, end_date, refresco)
+    metrics.registrar_cache(not faltantes)
+    for desde, hasta in faltantes:
+        _guardar(clave, descargar(desde, hasta), desde, hasta)
+    return _leer_almacenada(clave, start_date, end_date)
+
+@metrics.instrumentar("bcra", serie=lambda id_variable, *args, **kwargs: f"variable_{id_variable}")
+def get_bcra_variable(id_variable, start_date, end_date, refresco=None):
+    clave = f"bcra_{id_variable}"
     try:
-        response = requests.get(url, verify=False, timeout=10)
-        if response.status_code == 200:
-            data = response.json().get('results', [])
-            if not data:
-                st.warning(f"No se encontraron datos para la variable {id_variable} entre {start_date} y {end_date}.")
-                return pd.DataFrame()
-            df = pd.DataFrame(data)
-            df["fecha"] = pd.to_datetime(df["fecha"])
-            df["valor"] = pd.to_numeric(df["valor"], errors="coerce")
-            return df
-        elif response.status_code == 400:
-            st.error(f"Error 400: Fechas mal formateadas en la consulta al BCRA.")
-            return pd.DataFrame()
-        elif response.status_code == 404:
-            st.error(f"Error 404: Variable ID {id_variable} no encontrada en el BCRA.")
-            return pd.DataFrame()
-        else:
-            st.error(f"Error {response.status_code}: Problema en la API del BCRA. Intente nuevamente más tarde.")
-            return pd.DataFrame()
+        df = _serie_almacenada(
+            clave, lambda desde, hasta: _descargar_bcra_variable(id_variable, desde, hasta), start_date, end_date,
+            refresco
+        )
     except Exception as e:
-        st.error(f"Error al conectar con la API del BCRA: {e}")
-        return pd.DataFrame()
-
-def get_usd_oficial(fecha_inicio, fecha_fin):
-    url = "https://api.bcra.gob.ar/estadisticascambiarias/v1.0/Cotizaciones/USD"
-    params = {"fechadesde": fecha_inicio, "fechahasta": fecha_fin, "limit": 1000}
-    r = requests.get(url, params=params, verify=False)
-    data = r.json()["results"]
-    registros = []
-    for d in data:
-        fecha = d["fecha"]
-        for cot in d["detalle"]:
-            registros.append({"fecha": fecha, "usd_oficial": cot["tipoCotizacion"]})
-
-    df = pd.DataFrame(registros)
-    df["fecha"] = pd.to_datetime(df["fecha"])
-    df = df.groupby("fecha").mean(numeric_only=True).reset_index()
-    df = df.dropna(subset=["fecha", "usd_oficial"]).drop_duplicates(subset=["fecha"])
+        error = e if isinstance(e, BCRAError) else BCRAError(f"Error al conectar con la API del BCRA: {e}")
+    else:
+        if df.empty:
+            logger.warning("No se encontraron datos para la variable %s entre %s y %s.", id_variable, start_date, end_date)
+        return df
+
+    # Ante un error se sirve lo que ya esté almacenado; sin datos se propaga
+    df = _leer_almacenada(clave, start_date, end_date)
+    if df.empty:
+        raise error
+    logger.warning("Variable %s servida desde el almacén local: %s", id_variable, error)
     return df
 
-def get_usd_blue():
-    url = "https://api.bluelytics.com.ar/v2/evolution.json"
-    r = requests.get(url)
+def _tramos_fechas(start_date, end_date, dias):
+    tramos = []
+    inicio, fin = pd.Timestamp(start_date), pd.Timestamp(end_date)
+    while inicio <= fin:
+        hasta = min(inicio + pd.Timedelta(days=dias - 1), fin)
+        tramos.append((inicio.strftime("%Y-%m-%d"), hasta.strftime("%Y-%m-%d")))
+        inicio = hasta + pd.Timedelta(days=1)
+    return tramos
+
+def _descargar_cotizaciones(moneda, start_date, end_date):
+    # El endpoint corta en 1000 resultados: se parte el rango en tramos que se
+    # piden todos a la vez y se concatenan en orden
+    url = f"{BCRA_API_URL}/estadisticascambiarias/v1.0/Cotizaciones/{moneda}"
+    tramos = _tramos_fechas(start_date, end_date, COTIZACIONES_DIAS_POR_TRAMO)
+    respuestas = http_async.get_varios([
+        (url, {"fechadesde": desde, "fechahasta": hasta, "limit": 1000}) for desde, hasta in tramos
+    ])
+    resultados = []
+    for r in respuestas:
+        if isinstance(r, Exception):
+            raise r
+        if r.status_code != 200:
+            raise Exception(f"Error al obtener {moneda} Oficial")
+        resultados.extend(r.json()["results"])
+    return resultados
+
+def _get_cotizacion(moneda, columna, start_date, end_date, refresco=None):
+    def descargar(desde, hasta):
+        return cotizaciones_a_frame(_descargar_cotizaciones(moneda, desde, hasta), "valor")
+
+    df = _serie_almacenada(f"cotizaciones_{moneda}", descargar, start_date, end_date, refresco)
+    return df.rename(columns={"valor": columna})
+
+@metrics.instrumentar("bcra")
+def get_usd_oficial(fecha_inicio, fecha_fin, refresco=None):
+    return _get_cotizacion("USD", "usd_oficial", fecha_inicio, fecha_fin, refresco)
+
+def _descargar_usd_blue():
+    url = f"{BLUELYTICS_API_URL}/v2/evolution.json"
+    r = http_client.get(url)
     if r.status_code == 200:
         data = r.json()
         blue_data = [entry for entry in data if entry["source"] == "Blue"]
-        df = pd.DataFrame(blue_data)
+        df = pd.DataFrame(blue_data, columns=["date", "value_buy", "value_sell"])
         df["fecha"] = pd.to_datetime(df["date"])
         df["usd_blue"] = (df["value_buy"] + df["value_sell"]) / 2
         df = df.dropna(subset=["fecha", "usd_blue"]).drop_duplicates(subset=["fecha"])
-        return df[["fecha", "usd_blue"]]
+        return compactar(df, ["fecha", "usd_blue"]).reset_index(drop=True)
     else:
         raise Exception("Error al obtener USD Blue")
 
-def get_cny_oficial(start_date, end_date):
-    url = "https://api.bcra.gob.ar/estadisticascambiarias/v1.0/Cotizaciones/CNY"
-    params = {"fechadesde": start_date, "fechahasta": end_date, "limit": 1000}
-    r = requests.get(url, params=params, verify=False)
-    if r.status_code == 200:
-        data = r.json()['results']
-        registros = []
-        for d in data:
-            fecha = d['fecha']
-            for cot in d['detalle']:
-                registros.append({"fecha": fecha, "cny_oficial": cot['tipoCotizacion']})
-        df = pd.DataFrame(registros)
-        df['fecha'] = pd.to_datetime(df['fecha'])
-        return df.groupby('fecha').mean().reset_index()
-    else:
-        raise Exception("Error al obtener CNY Oficial")
+def _guardar_usd_blue():
+    df = _descargar_usd_blue()
+    _guardar(
+        "usd_blue", df.rename(columns={"usd_blue": "valor"}),
+        df["fecha"].min().strftime("%Y-%m-%d"), datetime.date.today().isoformat()
+    )
+    return df
+
+def _cargar_usd_blue():
+    # Si otro proceso (ej. prefetch) actualizó el almacén dentro del TTL se lee de disco
+    if series_store.vigente("usd_blue", BLUELYTICS_TTL):
+        return compactar(series_store.leer("usd_blue")).rename(columns={"valor": "usd_blue"})
+    return _guardar_usd_blue()
+
+@metrics.instrumentar("bluelytics")
+def get_usd_blue(start_date=None, end_date=None):
+    # La serie histórica completa se descarga una vez por TTL y se filtra localmente
+    df = _cache_blue.get_or_load("evolution", _cargar_usd_blue)
+    if start_date is not None:
+        df = df[df["fecha"] >= start_date]
+    if end_date is not None:
+        df = df[df["fecha"] <= end_date]
+    return df.reset_index(drop=True)
+
+@metrics.instrumentar("bluelytics")
+def actualizar_usd_blue():
+    # Descarga la serie ahora, sin esperar al TTL, y reemplaza la de memoria.
+    # Falla si falla la descarga, en vez de seguir sirviendo la serie anterior.
+    df = _guardar_usd_blue()
+    _cache_blue.invalidar("evolution")
+    return df
+
+@metrics.instrumentar("bcra")
+def get_cny_oficial(start_date, end_date, refresco=None):
+    return _get_cotizacion("CNY", "cny_oficial", start_date, end_date, refresco)
 
 def get_inflacion(start_date, end_date):
     return get_bcra_variable(27, start_date, end_date)
@@ -92,47 +303,253 @@ def get_reservas(start_date, end_date):
     return get_bcra_variable(1, start_date, end_date)
 
 def get_tipo_cambio(start_date, end_date):
+    # Ambas cotizaciones en cada día hábil, con el último valor publicado
     df_usd_oficial = get_usd_oficial(start_date, end_date)
-    df_usd_blue = get_usd_blue()
-    df_usd_blue = df_usd_blue[df_usd_blue['fecha'].between(start_date, end_date)]
-    df = pd.merge(df_usd_oficial, df_usd_blue, on='fecha', how='outer')
-    df = df.sort_values('fecha').reset_index(drop=True)
-    return df
+    df_usd_blue = get_usd_blue(start_date, end_date)
+    df = alinear({
+        "usd_oficial": a_serie(df_usd_oficial, "usd_oficial"),
+        "usd_blue": a_serie(df_usd_blue, "usd_blue"),
+    }, start_date, end_date)
+    return df.dropna(how="all").reset_index()
 
 def get_cny(start_date, end_date):
     df_cny = get_cny_oficial(start_date, end_date)
     df_cny = df_cny[df_cny['fecha'].between(start_date, end_date)].reset_index(drop=True)
     return df_cny
 
-def get_merval(start_date, end_date):
-    merval = yf.download("^MERV", start=start_date, end=end_date)
-    merval_close = merval.xs("Close", axis=1, level="Price")
-    merval = merval_close.rename(columns={"^MERV": "merval_ars"}).reset_index()
-    merval = merval.rename(columns={"Date": "fecha"})
+# yf.download comparte estado global entre llamadas: se serializa y se deja
+# que yfinance paralelice dentro del lote
+_yf_lock = threading.Lock()
 
-    df_usd_blue = get_usd_blue()
-    df_usd_blue = df_usd_blue[df_usd_blue["fecha"].between(start_date, end_date)]
+def _descargar_cierres(tickers, start_date, end_date):
+    # Precios de cierre: una columna por ticker, indexado por fecha (end_date exclusiva)
+    import yfinance as yf
+    with _yf_lock:
+        cierres = yf.download(list(tickers), start=start_date, end=end_date,
+                              progress=False, threads=YAHOO_MAX_WORKERS)["Close"]
+    return cierres.to_frame(tickers[0]) if isinstance(cierres, pd.Series) else cierres
 
-    df = pd.merge(merval, df_usd_blue, on="fecha", how="inner")
-    df["merval_usd"] = df["merval_ars"] / df["usd_blue"]
-    df = df.sort_values("fecha").reset_index(drop=True)
-    return df
+def _descargar_trabajos(trabajos):
+    # trabajos: (lote, desde, hasta) con fechas inclusivas. Devuelve los cierres
+    # de cada uno o la excepción con la que falló. yf.download se serializa con
+    # _yf_lock, así que los lotes se piden de a uno.
+    resultados = []
+    for lote, desde, hasta in trabajos:
+        try:
+            fin = (pd.Timestamp(hasta) + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+            resultados.append(_descargar_cierres(lote, desde, fin))
+        except Exception as e:
+            resultados.append(e)
+    return resultados
 
+def _cierres_almacenados(tickers, start_date, end_date, refresco=None):
+    # Cierres por ticker desde el almacén local. Los tickers con el mismo rango
+    # faltante se agrupan en lotes de YAHOO_LOTE y el rango se parte en tramos de
+    # YAHOO_DIAS_POR_TRAMO días; los pares (lote, tramo) se descargan con
+    # _descargar_trabajos. Las fechas son inclusivas.
+    pendientes = {}
+    for ticker in tickers:
+        for rango in series_store.rangos_faltantes(f"yahoo_{ticker}", start_date, end_date, refresco):
+            pendientes.setdefault(rango, []).append(ticker)
+    metrics.registrar_cache(not pendientes)
 
+    trabajos = []
+    for rango, grupo in pendientes.items():
+        for i in range(0, len(grupo), YAHOO_LOTE):
+            for tramo in _tramos_fechas(*rango, YAHOO_DIAS_POR_TRAMO):
+                trabajos.append((rango, tuple(grupo[i:i + YAHOO_LOTE]), tramo))
 
+    # Cierres por (ticker, rango). yf.download no lanza si falla un ticker: deja
+    # su columna en NaN, así que un tramo con días hábiles y sin ningún cierre
+    # cuenta como descarga fallida y el rango no se marca como cubierto.
+    descargas, fallidos = {}, {}
+    resultados = _descargar_trabajos([(lote, desde, hasta) for _, lote, (desde, hasta) in trabajos])
+    for (rango, lote, tramo), cierres in zip(trabajos, resultados):
+        for ticker in lote:
+            if (ticker, rango) in fallidos:
+                continue
+            if isinstance(cierres, Exception):
+                fallidos[(ticker, rango)] = cierres
+                continue
+            serie = cierres[ticker].dropna() if ticker in cierres.columns else pd.Series(dtype=float)
+            if serie.empty and len(dias_habiles(*tramo)):
+                fallidos[(ticker, rango)] = Exception(f"Yahoo no devolvió cierres de {ticker} entre {tramo[0]} y {tramo[1]}")
+                continue
+            descargas.setdefault((ticker, rango), []).append(serie)
 
-def get_cedears(start_date, end_date):
-    cedears = {
-    "YPFD.BA": "YPF",
-    "GGAL.BA": "Galicia",
-    "BMA.BA": "Banco Macro",
-    "MELI.BA": "MercadoLibre"
-}
-    data = yf.download(list(cedears.keys()), start=start_date, end=end_date)["Close"]
+    # Un rango se guarda solo si llegaron todos sus tramos, para no dejar huecos en la cobertura
+    for (ticker, (desde, hasta)), partes in descargas.items():
+        if (ticker, (desde, hasta)) in fallidos:
+            continue
+        serie = pd.concat(partes)
+        df = pd.DataFrame({"fecha": serie.index, "valor": serie.to_numpy()})
+        _guardar(f"yahoo_{ticker}", df, desde, hasta)
+    if fallidos:
+        pares = sum(len(grupo) for grupo in pendientes.values())
+        error = next(iter(fallidos.values()))
+        if len(fallidos) == pares:
+            raise error
+        logger.warning("Fallaron %d de %d descargas de Yahoo: %s", len(fallidos), pares, error)
+
+    df = pd.DataFrame({
+        ticker: series_store.leer(f"yahoo_{ticker}", start_date, end_date).set_index("fecha")["valor"]
+        for ticker in tickers
+    }, columns=list(tickers))
+    df.index.name = "Date"
+    return compactar(df)
+
+@metrics.instrumentar("yahoo")
+def get_merval_ars(start_date, end_date, refresco=None):
+    merval_close = _cierres_almacenados(["^MERV"], start_date, end_date, refresco)
+    merval = merval_close.rename(columns={"^MERV": "merval_ars"}).reset_index()
+    return merval.rename(columns={"Date": "fecha"})
+
+def get_merval(start_date, end_date):
+    # merval_usd sale del registro de indicadores (Merval / Blue vigente a cada fecha)
+    df = get_indicadores(["merval_ars", "usd_blue", "merval_usd"], start_date, end_date)
+    return df.dropna().reset_index()
+
+
+
+
+@metrics.instrumentar("yahoo")
+def get_cedears(start_date, end_date, cedears=None, refresco=None):
+    # cedears: {ticker: nombre}, por defecto el universo configurado en CEDEARS.
+    # Cada columna queda en base 100 respecto de su primer cierre del período.
+    cedears = cedears or CEDEARS
+    tickers = list(cedears)
+    data = _cierres_almacenados(tickers, start_date, end_date, refresco)
     df_cedears = data.reset_index()
     df_cedears = df_cedears.rename(columns={"Date": "fecha"})
-    for ticker in cedears.keys():
-        if ticker in df_cedears.columns and not df_cedears[ticker].dropna().empty:
-            df_cedears[ticker] = (df_cedears[ticker] / df_cedears[ticker].iloc[0]) * 100
-    df_cedears = df_cedears.dropna(how="all", subset=list(cedears.keys())).sort_values("fecha").reset_index(drop=True)
+    df_cedears = df_cedears.dropna(how="all", subset=tickers).sort_values("fecha").reset_index(drop=True)
+    if len(df_cedears):
+        df_cedears[tickers] = df_cedears[tickers] / df_cedears[tickers].bfill().iloc[0] * 100
+    df_cedears.attrs["nombres"] = dict(cedears)
     return df_cedears
+
+
+# --- Carga concurrente ---
+
+def cargar_en_paralelo(tareas, max_workers=8):
+    # tareas: {nombre: (funcion, args)}. Devuelve ({nombre: resultado}, {nombre: excepción})
+    @metrics.propagar
+    def ejecutar(funcion, args):
+        return funcion(*args)
+
+    resultados, errores = {}, {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futuros = {nombre: pool.submit(ejecutar, funcion, args) for nombre, (funcion, args) in tareas.items()}
+        for nombre, futuro in futuros.items():
+            try:
+                resultados[nombre] = futuro.result()
+            except Exception as e:
+                errores[nombre] = e
+    return resultados, errores
+
+def _datos_al(claves):
+    # Última verificación contra la fuente de la más vieja de las series del
+    # almacén que usa un panel. Si una descarga falló y se sirvió lo guardado,
+    # queda la fecha de ese dato y no la de la carga.
+    verificados = [cob["verificado"] for cob in map(series_store.cobertura, claves) if cob is not None]
+    return datetime.datetime.fromtimestamp(min(verificados)) if verificados else None
+
+def _serie_tablero(funcion, claves, start_date, end_date):
+    # Serie servida desde la caché stale-while-revalidate; attrs["datos_al"]
+    # indica cuándo se verificaron sus datos (claves: series del almacén que usa)
+    def cargar():
+        df = compactar(funcion(start_date, end_date))
+        datos_al = _datos_al(claves)
+        if datos_al is not None:
+            df.attrs["datos_al"] = datos_al
+        return df
+
+    clave = (funcion.__name__, start_date, end_date)
+    df = _cache_tablero.get_or_load(clave, cargar)
+    if df.empty:
+        # No retener resultados vacíos (ej. por un error transitorio de la fuente)
+        _cache_tablero.invalidar(clave)
+    return df
+
+def get_dashboard(start_date, end_date):
+    # nombre -> (fetcher, series del almacén de las que sale)
+    series = {
+        "inflacion": (get_inflacion, ["bcra_27"]),
+        "tasa": (get_tasa_monetaria, ["bcra_6"]),
+        "reservas": (get_reservas, ["bcra_1"]),
+        "tipo_cambio": (get_tipo_cambio, ["cotizaciones_USD", "usd_blue"]),
+        "cny": (get_cny, ["cotizaciones_CNY"]),
+        "merval": (get_merval, ["yahoo_^MERV", "usd_blue"]),
+        "cedears": (get_cedears, [f"yahoo_{ticker}" for ticker in CEDEARS]),
+    }
+    tareas = {
+        nombre: (_serie_tablero, (funcion, claves, start_date, end_date))
+        for nombre, (funcion, claves) in series.items()
+    }
+    return cargar_en_paralelo(tareas)
+
+
+# --- Panel de múltiples series ---
+
+# Series no BCRA disponibles en get_panel: nombre -> (fetcher, columna)
+SERIES_MERCADO = {
+    "usd_oficial": (get_usd_oficial, "usd_oficial"),
+    "usd_blue": (get_usd_blue, "usd_blue"),
+    "cny_oficial": (get_cny_oficial, "cny_oficial"),
+    "merval_ars": (get_merval_ars, "merval_ars"),
+    "merval_usd": (get_merval, "merval_usd"),
+}
+
+def get_panel(series, start_date, end_date, nombres=None, limite_dias=None):
+    # series: ids de variables BCRA (int) y/o claves de SERIES_MERCADO.
+    # Devuelve un DataFrame ancho indexado por día hábil con una columna por serie
+    # y el último valor conocido de cada una (limite_dias acota cuán viejo puede ser);
+    # nombres permite renombrar columnas ({15: "base_monetaria"}), por defecto var_<id>.
+    nombres = nombres or {}
+    tareas, columnas = {}, {}
+    for serie in series:
+        if isinstance(serie, str):
+            fetcher, columnas[serie] = SERIES_MERCADO[serie]
+            tareas[serie] = (fetcher, (start_date, end_date))
+        else:
+            columnas[serie] = "valor"
+            tareas[serie] = (get_bcra_variable, (serie, start_date, end_date))
+
+    # Las variables BCRA faltantes se bajan juntas, en un solo hilo, antes de
+    # leerlas del almacén
+    _precargar_bcra_variables([serie for serie in series if not isinstance(serie, str)], start_date, end_date)
+    resultados, errores = cargar_en_paralelo(tareas)
+    if errores:
+        serie, error = next(iter(errores.items()))
+        raise Exception(f"Error al obtener {serie}: {error}")
+
+    # Alinear todas las series sobre el calendario de días hábiles (as-of)
+    panel = alinear({
+        nombres.get(serie, serie if isinstance(serie, str) else f"var_{serie}"):
+            a_serie(resultados[serie], columnas[serie])
+        for serie in series
+    }, start_date, end_date, limite_dias=limite_dias)
+    return compactar(panel.dropna(how="all"))
+
+
+# --- Indicadores derivados ---
+
+def get_indicadores(nombres, start_date, end_date, limite_dias=None):
+    # nombres: indicadores de indicadores.INDICADORES, series de indicadores.HOJAS
+    # y/o ids de variables BCRA (columna var_<id>). Cada serie base se descarga
+    # una sola vez aunque la usen varios indicadores; devuelve un panel por día
+    # hábil como get_panel.
+    textos = [nombre for nombre in nombres if isinstance(nombre, str)]
+    hojas = indicadores.hojas(textos)
+    columnas_panel = {indicadores.HOJAS[hoja]: hoja for hoja in hojas}
+    ids = [nombre for nombre in nombres if not isinstance(nombre, str) and nombre not in columnas_panel]
+    panel = get_panel(
+        list(columnas_panel) + ids, start_date, end_date, nombres=columnas_panel, limite_dias=limite_dias
+    )
+    calculado = indicadores.evaluar(textos, panel)
+    columnas = {}
+    for nombre in nombres:
+        if isinstance(nombre, str):
+            columnas[nombre] = calculado[nombre]
+        else:
+            columnas[f"var_{nombre}"] = panel[columnas_panel.get(nombre, f"var_{nombre}")]
+    return pd.DataFrame(columnas, index=panel.index)
@@ -0,0 +1,46 @@
+# decoders.py
+
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+# --- Decodificación columnar de respuestas de la API ---
+
+
+def decodificar_cotizaciones(resultados, codigo_moneda=None, campo="tipoCotizacion"):
+    # Convierte results[].detalle[] de /Cotizaciones en arreglos (fechas, valores)
+    # con el promedio diario de `campo`, sin armar un dict por cotización.
+    # codigo_moneda filtra las cotizaciones por su codigoMoneda.
+    if not resultados:
+        return np.array([], dtype="datetime64[ns]"), np.array([], dtype=float)
+
+    detalles = [d["detalle"] for d in resultados]
+    largos = np.fromiter(map(len, detalles), dtype=np.intp, count=len(detalles))
+    cotizaciones = list(chain.from_iterable(detalles))
+
+    crudos = [c.get(campo) for c in cotizaciones]
+    try:
+        valores = np.array(crudos, dtype=float)
+    except (TypeError, ValueError):
+        valores = pd.to_numeric(pd.Series(crudos, dtype=object), errors="coerce").to_numpy(dtype=float)
+
+    validos = ~np.isnan(valores)
+    if codigo_moneda is not None:
+        validos &= np.array([c.get("codigoMoneda") == codigo_moneda for c in cotizaciones], dtype=bool)
+
+    # Agrupar por fecha (ordenada y sin duplicados) con bincount
+    fechas, inversa = np.unique(
+        np.array([d["fecha"] for d in resultados], dtype="datetime64[D]"), return_inverse=True
+    )
+    grupo = np.repeat(inversa, largos)[validos]
+    suma = np.bincount(grupo, weights=valores[validos], minlength=len(fechas))
+    cuenta = np.bincount(grupo, minlength=len(fechas))
+
+    con_dato = cuenta > 0
+    return fechas[con_dato].astype("datetime64[ns]"), suma[con_dato] / cuenta[con_dato]
+
+
+def cotizaciones_a_frame(resultados, columna, codigo_moneda=None):
+    fechas, valores = decodificar_cotizaciones(resultados, codigo_moneda)
+    return pd.DataFrame({"fecha": fechas, columna: valores})
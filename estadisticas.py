@@ -0,0 +1,191 @@
+# estadisticas.py
+
+import hashlib
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+# --- Estadísticas móviles y acumuladas ---
+# Variaciones (mom, yoy), inflación interanual compuesta, acumulada, medias
+# móviles y volatilidad sobre una columna de un frame con "fecha". Cada
+# resultado se memoriza por serie: si la serie vuelve extendida hacia adelante
+# solo se calculan los puntos nuevos, más la ventana hacia atrás que necesita
+# la estadística (y el último día ya calculado, que pudo ser provisorio). Si
+# cambió algún valor anterior (ej. el almacén corrigió datos provisorios) o
+# llegaron fechas intermedias, se recalcula todo.
+#
+# Nombres disponibles:
+#   mom, yoy         variación % contra el valor vigente un mes / un año antes
+#   yoy_compuesta    variación interanual de una tasa mensual en % (ej. inflación)
+#   acumulada        acumulada compuesta de una tasa en % desde el inicio del rango
+#   sma_<n>          media móvil de n observaciones
+#   sma_<n>d         media móvil de n días corridos
+#   vol_<n>          volatilidad anualizada (%) de los retornos log de n observaciones
+
+_PATRON = re.compile(r"^(mom|yoy|yoy_compuesta|acumulada|sma_(\d+)(d?)|vol_(\d+))$")
+
+_cache = {}  # (clave, columna, estadistica) -> (primera fecha, última fecha, Series por fecha, huella de la entrada)
+_lock = threading.Lock()
+
+
+def _huella(serie):
+    # Hash en orden de fechas y valores
+    return hashlib.blake2b(pd.util.hash_pandas_object(serie).to_numpy().tobytes()).hexdigest()
+
+
+def _variacion(serie, desplazamiento):
+    # Contra el último valor conocido a la fecha desplazada (as-of)
+    anterior = serie.reindex(serie.index - desplazamiento, method="ffill").to_numpy()
+    return (serie / anterior - 1) * 100
+
+
+def _volatilidad(serie, n):
+    retornos = np.log(serie).diff()
+    return retornos.rolling(n, min_periods=n).std() * np.sqrt(252) * 100
+
+
+def _acumulada(serie, previo):
+    # previo: acumulada en % del día anterior al tramo, para seguir compuesto
+    base = np.log1p(previo / 100) if previo is not None and not np.isnan(previo) else 0.0
+    return np.expm1(base + np.log1p(serie / 100).cumsum()) * 100
+
+
+def definicion(nombre):
+    # (función de la serie, ventana hacia atrás en filas o Timedelta, acumulativa)
+    coincidencia = _PATRON.match(nombre)
+    if coincidencia is None:
+        raise Exception(f"Estadística desconocida: {nombre}")
+    if nombre == "mom":
+        return (lambda s: _variacion(s, pd.DateOffset(months=1))), pd.Timedelta(days=45), False
+    if nombre == "yoy":
+        return (lambda s: _variacion(s, pd.DateOffset(years=1))), pd.Timedelta(days=380), False
+    if nombre == "yoy_compuesta":
+        return (lambda s: np.expm1(np.log1p(s / 100).rolling(12, min_periods=12).sum()) * 100), 11, False
+    if nombre == "acumulada":
+        return _acumulada, 0, True
+    if nombre.startswith("sma_"):
+        n = int(coincidencia.group(2))
+        if coincidencia.group(3):
+            return (lambda s: s.rolling(f"{n}D").mean()), pd.Timedelta(days=n), False
+        return (lambda s: s.rolling(n, min_periods=n).mean()), n - 1, False
+    n = int(coincidencia.group(4))
+    return (lambda s: _volatilidad(s, n)), n, False
+
+
+def _calcular(clave, serie, nombre):
+    funcion, ventana, acumulativa = definicion(nombre)
+    desde, hasta = serie.index[0], serie.index[-1]
+    with _lock:
+        previo = _cache.get((clave, serie.name, nombre))
+
+    incremental = False
+    if previo is not None and previo[0] == desde and previo[1] <= hasta and len(previo[2]):
+        # Se recorta por fecha y se compara con la entrada del cálculo anterior:
+        # fechas intermedias nuevas o valores corregidos obligan a recalcular todo
+        corte = serie.index.searchsorted(previo[1])
+        anterior = previo[2][previo[2].index < previo[1]]
+        incremental = _huella(serie.iloc[:corte]) == previo[3]
+
+    if incremental:
+        if acumulativa:
+            valor_previo = anterior.iloc[-1] if corte > 0 else None
+            nuevos = funcion(serie.iloc[corte:], valor_previo)
+        else:
+            if isinstance(ventana, pd.Timedelta):
+                inicio = serie.index.searchsorted(serie.index[corte] - ventana)
+            else:
+                inicio = max(0, corte - ventana)
+            nuevos = funcion(serie.iloc[inicio:]).iloc[corte - inicio:]
+        resultado = pd.concat([anterior, nuevos])
+    else:
+        resultado = funcion(serie, None) if acumulativa else funcion(serie)
+
+    resultado = resultado.astype(serie.dtype)
+    with _lock:
+        _cache[(clave, serie.name, nombre)] = (desde, hasta, resultado, _huella(serie.iloc[:-1]))
+    return resultado
+
+
+def agregar_columnas(clave, df, columnas, estadisticas):
+    # Devuelve df con una columna <columna>_<estadistica> por cada combinación.
+    # clave identifica la serie (ej. el nombre del fetcher) para reutilizar lo ya calculado.
+    if not estadisticas:
+        return df
+    if df.empty:
+        return df.assign(**{f"{c}_{e}": np.nan for c in columnas for e in estadisticas})
+    fechas = df["fecha"]
+    extras = {}
+    for columna in columnas:
+        serie = df.set_index("fecha")[columna].dropna()
+        serie = serie[~serie.index.duplicated(keep="last")].sort_index()
+        for nombre in estadisticas:
+            calculada = _calcular(clave, serie, nombre) if len(serie) else serie
+            extras[f"{columna}_{nombre}"] = calculada.reindex(fechas).to_numpy()
+    return df.assign(**extras)
+
+
+def invalidar(clave=None):
+    with _lock:
+        if clave is None:
+            _cache.clear()
+        else:
+            for entrada in [e for e in _cache if e[0] == clave]:
+                del _cache[entrada]
+
+
+# --- Correlaciones ---
+
+
+def _correlacion(x, y):
+    # Correlación de Pearson entre cada columna de x (n×a) y cada columna de y
+    # (n×b) usando, para cada par, solo las filas donde ambas tienen dato. Todo
+    # sale de cinco productos matriciales, sin recorrer los pares.
+    mx, my = ~np.isnan(x), ~np.isnan(y)
+    x0, y0 = np.where(mx, x, 0.0), np.where(my, y, 0.0)
+    mx, my = mx.astype(float), my.astype(float)
+    n = mx.T @ my
+    sx, sy = x0.T @ my, mx.T @ y0
+    sxx, syy = (x0 ** 2).T @ my, mx.T @ (y0 ** 2)
+    sxy = x0.T @ y0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = (n * sxy - sx * sy) / np.sqrt((n * sxx - sx ** 2) * (n * syy - sy ** 2))
+    r[n < 3] = np.nan
+    return np.clip(r, -1.0, 1.0)
+
+
+def transformar(panel, transformacion="niveles"):
+    # "niveles" deja los valores; "variaciones" usa la variación % entre observaciones
+    if transformacion == "variaciones":
+        return panel.pct_change(fill_method=None) * 100
+    return panel
+
+
+def correlaciones(panel):
+    # Matriz de correlación entre todas las columnas del panel
+    valores = panel.to_numpy(dtype=float)
+    return pd.DataFrame(_correlacion(valores, valores), index=panel.columns, columns=panel.columns)
+
+
+def correlaciones_cruzadas(panel, referencia, max_rezago):
+    # Correlación de cada columna en t con la referencia en t - rezago, para
+    # rezago en [-max_rezago, max_rezago]: un rezago positivo indica que la
+    # referencia se anticipa a la columna
+    valores = panel.to_numpy(dtype=float)
+    ref = panel[referencia].to_numpy(dtype=float)
+    rezagos = np.arange(-max_rezago, max_rezago + 1)
+    relleno = np.full(max_rezago, np.nan)
+    extendida = np.concatenate([relleno, ref, relleno])
+    # Columna j = referencia desplazada rezagos[j] filas, armada con una vista sin copias
+    ventanas = np.lib.stride_tricks.sliding_window_view(extendida, len(ref))
+    desplazadas = ventanas[max_rezago - rezagos].T
+    return pd.DataFrame(_correlacion(desplazadas, valores), index=pd.Index(rezagos, name="rezago"),
+                        columns=panel.columns)
+
+
+def normalizar(panel, base=100):
+    # Cada columna en base `base` respecto de su primer valor disponible
+    if panel.empty:
+        return panel
+    return panel / panel.bfill().iloc[0] * base
@@ -0,0 +1,49 @@
+# frames.py
+
+import os
+
+import numpy as np
+import pandas as pd
+
+# --- Normalización de frames ---
+# Todo frame que sale de data_fetching (y que queda en las cachés) pasa por
+# compactar: solo las columnas pedidas, fecha como datetime64 y valores en
+# float32. float32 guarda ~7 dígitos significativos, de sobra para tasas,
+# cotizaciones e índices; FRAMES_FLOAT=float64 vuelve a la precisión completa.
+
+FLOAT_DTYPE = np.dtype(os.environ.get("FRAMES_FLOAT", "float32"))
+
+
+def compactar(df, columnas=None):
+    # columnas: proyección opcional (ej. ["fecha", "valor"]); el índice se conserva
+    if columnas is not None:
+        df = df[list(columnas)]
+    tipos = {}
+    for columna, tipo in df.dtypes.items():
+        if columna == "fecha":
+            if not pd.api.types.is_datetime64_dtype(tipo):
+                tipos[columna] = "datetime64[ns]"
+        elif pd.api.types.is_numeric_dtype(tipo) and not pd.api.types.is_bool_dtype(tipo) and tipo != FLOAT_DTYPE:
+            tipos[columna] = FLOAT_DTYPE
+    return df.astype(tipos) if tipos else df
+
+
+def memoria(df):
+    # Bytes ocupados por el frame, índice incluido
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def reporte_memoria(frames):
+    # frames: {nombre: DataFrame}. Una fila por frame con su tamaño actual y el
+    # que tendría con valores float64
+    filas = []
+    for nombre, df in frames.items():
+        extra = df.select_dtypes("float32").size * 4
+        filas.append({
+            "serie": nombre,
+            "filas": len(df),
+            "columnas": df.shape[1],
+            "KB": round(memoria(df) / 1024, 1),
+            "KB float64": round((memoria(df) + extra) / 1024, 1),
+        })
+    return filas
@@ -0,0 +1,179 @@
+# http_async.py
+
+import asyncio
+import atexit
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import http_client
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# --- Motor asíncrono de descargas ---
+# Un event loop en un hilo de fondo atiende los pedidos de todos los fetchers:
+# decenas de GET concurrentes sin un hilo por pedido. La tasa y los pedidos en
+# vuelo por host los regula el mismo límite adaptativo de http_client, así que
+# se comparten con los pedidos sincrónicos. Con aiohttp (en requirements.txt)
+# los pedidos son asíncronos de punta a punta. Si no está instalado, o con
+# HTTP_MOTOR=hilos, cada pedido corre con http_client.pedir en un pool de hilos.
+#
+# El código sincrónico usa get_varios; el asíncrono puede esperar get desde
+# cualquier event loop.
+
+HTTP_MOTOR = os.environ.get("HTTP_MOTOR", "auto")  # auto | aiohttp | hilos
+
+
+class Respuesta:
+    # Lo que usan los fetchers de requests.Response
+    def __init__(self, url, status_code, content, headers):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+
+    def json(self):
+        return json.loads(self.content)
+
+
+_loop = None
+_hilo = None
+_aiohttp = None    # módulo aiohttp si el motor lo usa
+_pool = None       # hilos del motor sin aiohttp
+_sesiones = {}     # host -> aiohttp.ClientSession; solo se toca desde el loop
+_lock = threading.Lock()
+
+
+def _importar_aiohttp():
+    if HTTP_MOTOR == "hilos":
+        return None
+    try:
+        import aiohttp
+    except ImportError:
+        if HTTP_MOTOR == "aiohttp":
+            raise
+        return None
+    return aiohttp
+
+
+def _motor():
+    # Arranca el event loop de fondo la primera vez que se lo necesita
+    global _loop, _hilo, _aiohttp, _pool
+    with _lock:
+        if _loop is None:
+            _aiohttp = _importar_aiohttp()
+            if _aiohttp is None and _pool is None:
+                _pool = ThreadPoolExecutor(max_workers=http_client.POOL_MAXSIZE, thread_name_prefix="http_async")
+            loop = asyncio.new_event_loop()
+            _hilo = threading.Thread(target=loop.run_forever, name="http_async", daemon=True)
+            _hilo.start()
+            _loop = loop
+            logger.info("Motor de descargas: %s", "aiohttp" if _aiohttp else "hilos")
+    return _loop
+
+
+def _sesion(host):
+    sesion = _sesiones.get(host)
+    if sesion is None:
+        conector = _aiohttp.TCPConnector(limit=http_client.HTTP_MAX_POR_HOST, ssl=host not in http_client.HOSTS_SIN_VERIFICACION)
+        conexion, lectura = http_client.TIMEOUT
+        timeout = _aiohttp.ClientTimeout(sock_connect=conexion, sock_read=lectura)
+        sesion = _sesiones[host] = _aiohttp.ClientSession(connector=conector, timeout=timeout)
+    return sesion
+
+
+async def _pedir_aiohttp(url, params):
+    # Misma política de reintentos que http_client.pedir, con cada intento
+    # dentro del límite del host
+    sesion = _sesion(urlsplit(url).netloc)
+    limite_host = http_client.limite(url)
+    for intento in range(http_client.REINTENTOS + 1):
+        ultimo = intento == http_client.REINTENTOS
+        enviado = await limite_host.entrar_async()
+        respuesta = None
+        try:
+            async with sesion.get(url, params=params) as r:
+                respuesta = Respuesta(str(r.url), r.status, await r.read(), r.headers)
+        except (_aiohttp.ClientError, asyncio.TimeoutError):
+            if ultimo:
+                raise
+        finally:
+            # El cupo se devuelve siempre, también si la tarea se cancela
+            if respuesta is None:
+                limite_host.salir(enviado)
+            else:
+                limite_host.salir(enviado, respuesta.status_code, http_client.retry_after(respuesta))
+        if respuesta is None:
+            espera = http_client.BACKOFF * 2 ** intento
+        elif respuesta.status_code not in http_client.ESTADOS_REINTENTO or ultimo:
+            return respuesta, intento
+        else:
+            espera = http_client.espera_reintento(respuesta, intento)
+        await asyncio.sleep(espera)
+
+
+async def _pedir(url, params):
+    # (respuesta, reintentos); corre en el loop del motor
+    if _aiohttp is not None:
+        return await _pedir_aiohttp(url, params)
+    return await asyncio.get_running_loop().run_in_executor(_pool, lambda: http_client.pedir(url, params=params))
+
+
+async def get(url, params=None):
+    loop = _motor()
+    if asyncio.get_running_loop() is loop:
+        respuesta, reintentos = await _pedir(url, params)
+    else:
+        respuesta, reintentos = await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(_pedir(url, params), loop))
+    metrics.registrar_http(len(respuesta.content), reintentos)
+    return respuesta
+
+
+def get_varios(pedidos):
+    # Fachada sincrónica. pedidos: lista de url o (url, params). Se descargan
+    # todos a la vez y se devuelve, en el mismo orden, la respuesta de cada uno
+    # o la excepción con la que falló.
+    pedidos = [(pedido, None) if isinstance(pedido, str) else pedido for pedido in pedidos]
+    if not pedidos:
+        return []
+    loop = _motor()
+    if threading.current_thread() is _hilo:
+        raise Exception("get_varios no se puede llamar desde el motor de descargas; usar await get")
+
+    async def todos():
+        return await asyncio.gather(*(_pedir(url, params) for url, params in pedidos), return_exceptions=True)
+
+    respuestas = []
+    # Las métricas se registran en este hilo, dentro de la medición del fetcher que llamó
+    for resultado in asyncio.run_coroutine_threadsafe(todos(), loop).result():
+        if isinstance(resultado, BaseException):
+            respuestas.append(resultado)
+            continue
+        respuesta, reintentos = resultado
+        metrics.registrar_http(len(respuesta.content), reintentos)
+        respuestas.append(respuesta)
+    return respuestas
+
+
+def cerrar():
+    # Cierra las sesiones y detiene el loop; el próximo pedido arranca uno nuevo
+    global _loop
+    with _lock:
+        loop, _loop = _loop, None
+    if loop is None:
+        return
+
+    async def cerrar_sesiones():
+        for sesion in list(_sesiones.values()):
+            await sesion.close()
+        _sesiones.clear()
+
+    asyncio.run_coroutine_threadsafe(cerrar_sesiones(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+
+
+atexit.register(cerrar)
@@ -0,0 +1,251 @@
+# http_client.py
+
+import asyncio
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import metrics
+
+# --- Sesiones HTTP compartidas ---
+# Una sesión por host con pool de conexiones (keep-alive), reintentos con
+# backoff exponencial y timeouts acotados para todos los fetchers.
+
+TIMEOUT = (5, 20)  # (conexión, lectura) en segundos
+POOL_MAXSIZE = 16
+
+# api.bcra.gob.ar no presenta una cadena de certificados válida
+HOSTS_SIN_VERIFICACION = {"api.bcra.gob.ar"}
+
+# Reintentos ante estos estados, con backoff exponencial (BACKOFF, 2×BACKOFF, ...)
+# o lo que indique Retry-After. Los maneja pedir, no urllib3, para que cada
+# intento pase por el límite del host.
+REINTENTOS = 3
+BACKOFF = 0.5
+ESTADOS_REINTENTO = (429, 500, 502, 503, 504)
+
+_sesiones = {}
+_lock = threading.Lock()
+
+
+def _politica_reintentos():
+    # Solo errores de conexión; los estados HTTP se reintentan en pedir
+    return Retry(
+        total=REINTENTOS,
+        backoff_factor=BACKOFF,
+        status_forcelist=(),
+        allowed_methods=frozenset(["GET"]),
+        raise_on_status=False
+    )
+
+
+def get_session(url):
+    host = urlsplit(url).netloc
+    with _lock:
+        sesion = _sesiones.get(host)
+        if sesion is None:
+            sesion = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE, max_retries=_politica_reintentos())
+            sesion.mount("https://", adapter)
+            sesion.mount("http://", adapter)
+            sesion.verify = host not in HOSTS_SIN_VERIFICACION
+            _sesiones[host] = sesion
+    return sesion
+
+
+# --- Límite de tasa y concurrencia adaptativa por host ---
+# Cada host tiene un token bucket (pedidos por segundo sostenidos, con ráfagas
+# de hasta HTTP_RAFAGA) y un cupo de pedidos en vuelo que se ajusta por AIMD:
+# mientras se usa entero crece de a uno por cada ventana de respuestas
+# exitosas, hasta HTTP_MAX_POR_HOST, y se reduce a la mitad ante 429/503 (una
+# vez por tanda: no cuentan las respuestas de pedidos enviados antes del
+# recorte). Un Retry-After pausa al host entero. El mismo límite lo usan los
+# pedidos sincrónicos (pedir) y los del motor asíncrono (http_async), así que
+# todos los fetchers comparten el presupuesto.
+
+HTTP_MAX_POR_HOST = int(os.environ.get("HTTP_MAX_POR_HOST", 8))
+HTTP_CONCURRENCIA_INICIAL = int(os.environ.get("HTTP_CONCURRENCIA_INICIAL", 4))
+# Pedidos por segundo para hosts sin tasa propia; 0 es sin límite
+HTTP_TASA = float(os.environ.get("HTTP_TASA", 0))
+HTTP_RAFAGA = int(os.environ.get("HTTP_RAFAGA", 10))
+
+
+def _tasas(texto):
+    # "api.bcra.gob.ar:10,api.bluelytics.com.ar:5" -> {host: tasa}
+    tasas = {}
+    for item in filter(None, (i.strip() for i in texto.split(","))):
+        host, _, tasa = item.rpartition(":")
+        tasas[host.strip()] = float(tasa)
+    return tasas
+
+
+TASAS_HOST = {"api.bcra.gob.ar": 10.0, "api.bluelytics.com.ar": 5.0}
+TASAS_HOST.update(_tasas(os.environ.get("HTTP_TASAS", "")))
+
+# Estados que indican que el host está limitando los pedidos
+ESTADOS_LIMITE = (429, 503)
+
+
+def _despertar(futuro):
+    if not futuro.done():
+        futuro.set_result(None)
+
+
+class LimiteHost:
+    def __init__(self, tasa, rafaga=HTTP_RAFAGA, concurrencia=HTTP_CONCURRENCIA_INICIAL,
+                 concurrencia_max=HTTP_MAX_POR_HOST):
+        self.tasa = tasa
+        self.rafaga = rafaga
+        self.concurrencia_max = concurrencia_max
+        self.concurrencia = float(min(concurrencia, concurrencia_max))
+        self.en_vuelo = 0
+        self.limitados = 0  # respuestas 429/503 recibidas
+        self._tokens = float(rafaga)
+        self._actualizado = time.monotonic()
+        self._pausa_hasta = 0.0
+        self._ultimo_recorte = 0.0
+        self._lock = threading.Lock()
+        self._condicion = threading.Condition(self._lock)
+        self._esperas = []  # (loop, future) de pedidos asíncronos esperando cupo
+
+    def _hay_cupo(self):
+        return self.en_vuelo < int(self.concurrencia)
+
+    def _reservar(self):
+        # Toma un token (puede quedar debiendo) y devuelve los segundos a esperar
+        with self._lock:
+            ahora = time.monotonic()
+            espera = max(0.0, self._pausa_hasta - ahora)
+            if self.tasa > 0:
+                self._tokens = min(self.rafaga, self._tokens + (ahora - self._actualizado) * self.tasa)
+                self._actualizado = ahora
+                self._tokens -= 1
+                if self._tokens < 0:
+                    espera = max(espera, -self._tokens / self.tasa)
+            return espera
+
+    def entrar(self):
+        # Primero el token y después el cupo, así el cupo solo cuenta pedidos
+        # enviados. Devuelve el momento de envío, que se pasa a salir.
+        time.sleep(self._reservar())
+        with self._condicion:
+            while not self._hay_cupo():
+                self._condicion.wait()
+            self.en_vuelo += 1
+        return time.monotonic()
+
+    async def entrar_async(self):
+        await asyncio.sleep(self._reservar())
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                if self._hay_cupo():
+                    self.en_vuelo += 1
+                    break
+                futuro = loop.create_future()
+                self._esperas.append((loop, futuro))
+            await futuro
+        return time.monotonic()
+
+    def salir(self, enviado, estado=None, retry_after=None):
+        # enviado: lo que devolvió entrar; estado: código HTTP de la respuesta,
+        # o None si el pedido falló sin respuesta
+        with self._condicion:
+            lleno = self.en_vuelo >= int(self.concurrencia)
+            self.en_vuelo -= 1
+            ahora = time.monotonic()
+            if estado in ESTADOS_LIMITE:
+                self.limitados += 1
+                if enviado >= self._ultimo_recorte:
+                    self.concurrencia = max(1.0, self.concurrencia / 2)
+                    self._ultimo_recorte = ahora
+                if retry_after:
+                    self._pausa_hasta = max(self._pausa_hasta, ahora + retry_after)
+            elif estado is not None and estado < 500 and lleno:
+                # +1 por cada ventana completa de respuestas sin limitación
+                self.concurrencia = min(self.concurrencia_max, self.concurrencia + 1 / self.concurrencia)
+            self._condicion.notify_all()
+            esperas, self._esperas = self._esperas, []
+        for loop, futuro in esperas:
+            loop.call_soon_threadsafe(_despertar, futuro)
+
+    def estado(self):
+        with self._lock:
+            return {
+                "concurrencia": int(self.concurrencia),
+                "en_vuelo": self.en_vuelo,
+                "tasa": self.tasa,
+                "limitados": self.limitados,
+                "pausa_s": round(max(0.0, self._pausa_hasta - time.monotonic()), 1),
+            }
+
+
+_limites = {}
+
+
+def limite(url):
+    host = urlsplit(url).netloc
+    with _lock:
+        limite_host = _limites.get(host)
+        if limite_host is None:
+            limite_host = _limites[host] = LimiteHost(TASAS_HOST.get(host, HTTP_TASA))
+    return limite_host
+
+
+def estado_limites():
+    with _lock:
+        limites = dict(_limites)
+    return [{"host": host, **limite_host.estado()} for host, limite_host in sorted(limites.items())]
+
+
+def retry_after(response):
+    try:
+        return float(response.headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+def espera_reintento(response, intento):
+    return retry_after(response) or BACKOFF * 2 ** intento
+
+
+# --- Pedidos ---
+
+
+def pedir(url, params=None, timeout=TIMEOUT, **kwargs):
+    # GET sin registrar métricas; devuelve (respuesta, reintentos usados). Tras
+    # el último reintento se devuelve la respuesta con error para que el
+    # fetcher lo informe.
+    sesion = get_session(url)
+    limite_host = limite(url)
+    # verify explícito: si no, REQUESTS_CA_BUNDLE pisa la configuración de la sesión
+    kwargs.setdefault("verify", sesion.verify)
+    usados = 0
+    for intento in range(REINTENTOS + 1):
+        enviado = limite_host.entrar()
+        response = None
+        try:
+            response = sesion.get(url, params=params, timeout=timeout, **kwargs)
+        finally:
+            if response is None:
+                limite_host.salir(enviado)
+            else:
+                limite_host.salir(enviado, response.status_code, retry_after(response))
+        conexion = getattr(response.raw, "retries", None)
+        usados += intento > 0
+        usados += len(conexion.history) if conexion else 0
+        if response.status_code not in ESTADOS_REINTENTO or intento == REINTENTOS:
+            return response, usados
+        response.close()
+        time.sleep(espera_reintento(response, intento))
+
+
+def get(url, params=None, timeout=TIMEOUT, **kwargs):
+    response, reintentos = pedir(url, params=params, timeout=timeout, **kwargs)
+    metrics.registrar_http(len(response.content), reintentos)
+    return response
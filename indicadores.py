@@ -0,0 +1,129 @@
+# indicadores.py
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+import metrics
+
+# --- Indicadores derivados ---
+# Registro declarativo de indicadores calculados a partir de otras series.
+# Cada indicador declara sus dependencias (series base u otros indicadores) y
+# una función que opera elemento a elemento sobre Series alineadas por fecha.
+# Se evalúan en orden topológico sobre un panel de series base descargado una
+# sola vez, y cada resultado queda memorizado junto con las entradas que lo
+# produjeron: en la próxima evaluación solo se calculan las fechas nuevas y
+# las que cambiaron de entrada (un dato provisorio corregido, una serie que
+# llegó tarde y antes se completaba con el último valor, otro limite_dias).
+
+# Series base: nombre -> serie de data_fetching.get_panel (id BCRA o clave de SERIES_MERCADO)
+HOJAS = {
+    "reservas": 1,
+    "tasa_monetaria": 6,
+    "base_monetaria": 15,
+    "inflacion": 27,
+    "usd_oficial": "usd_oficial",
+    "usd_blue": "usd_blue",
+    "cny_oficial": "cny_oficial",
+    "merval_ars": "merval_ars",
+}
+
+# nombre -> (dependencias, función)
+INDICADORES = {}
+
+_memo = {}  # nombre -> (DataFrame de entradas, Series de valores), indexados por fecha
+_lock = threading.Lock()
+
+
+def registrar(nombre, dependencias, funcion):
+    if nombre in HOJAS:
+        raise Exception(f"{nombre} ya es una serie base")
+    INDICADORES[nombre] = (tuple(dependencias), funcion)
+    # Lo memorizado de otros indicadores pudo depender de la definición anterior
+    invalidar()
+
+
+def orden(nombres):
+    # Series base e indicadores necesarios para calcular nombres, con cada
+    # dependencia antes de quien la usa
+    resultado, visitados, en_curso = [], set(), set()
+
+    def visitar(nombre):
+        if nombre in visitados:
+            return
+        if nombre in en_curso:
+            raise Exception(f"Dependencia circular en el indicador {nombre}")
+        if nombre not in HOJAS and nombre not in INDICADORES:
+            raise Exception(f"Indicador desconocido: {nombre}")
+        en_curso.add(nombre)
+        for dependencia in INDICADORES.get(nombre, ((), None))[0]:
+            visitar(dependencia)
+        en_curso.discard(nombre)
+        visitados.add(nombre)
+        resultado.append(nombre)
+
+    for nombre in nombres:
+        visitar(nombre)
+    return resultado
+
+
+def hojas(nombres):
+    return [nombre for nombre in orden(nombres) if nombre in HOJAS]
+
+
+def evaluar(nombres, panel):
+    # panel: DataFrame indexado por fecha con una columna por serie base necesaria
+    panel = panel.copy()
+    for nombre in orden(nombres):
+        if nombre not in HOJAS:
+            panel[nombre] = _calcular(nombre, panel)
+    return panel[list(nombres)]
+
+
+def _calcular(nombre, panel):
+    dependencias, funcion = INDICADORES[nombre]
+    with _lock:
+        previo = _memo.get(nombre)
+
+    entradas = panel[list(dependencias)]
+    if previo is None:
+        valores = pd.Series(np.nan, index=panel.index, dtype="float32")
+        pendientes = np.ones(len(panel), dtype=bool)
+    else:
+        entradas_previas, valores_previos = previo
+        valores = valores_previos.reindex(panel.index).astype("float32")
+        anteriores = entradas_previas.reindex(panel.index)
+        iguales = (entradas == anteriores) | (entradas.isna() & anteriores.isna())
+        pendientes = ~panel.index.isin(valores_previos.index) | ~iguales.all(axis=1).to_numpy()
+
+    metrics.registrar_cache(not pendientes.any())
+    if pendientes.any():
+        filas = entradas[pendientes]
+        valores[pendientes] = funcion(*(filas[d] for d in dependencias)).to_numpy()
+        if previo is not None:
+            # Las fechas fuera de este panel se conservan
+            fuera = ~entradas_previas.index.isin(panel.index)
+            entradas = pd.concat([entradas_previas[fuera], entradas]).sort_index()
+            valores = pd.concat([valores_previos[fuera], valores]).sort_index()
+        with _lock:
+            _memo[nombre] = (entradas, valores)
+        valores = valores.reindex(panel.index)
+    return valores
+
+
+def invalidar(nombre=None):
+    # Descarta lo memorizado (ej. si una fuente corrigió datos históricos)
+    with _lock:
+        if nombre is None:
+            _memo.clear()
+        else:
+            _memo.pop(nombre, None)
+
+
+# --- Registro ---
+
+registrar("merval_usd", ["merval_ars", "usd_blue"], lambda merval, blue: merval / blue)
+registrar("base_usd", ["base_monetaria", "usd_oficial"], lambda base, oficial: base / oficial)
+registrar("brecha_cambiaria", ["usd_blue", "usd_oficial"], lambda blue, oficial: (blue / oficial - 1) * 100)
+registrar("cobertura_reservas", ["reservas", "base_usd"], lambda reservas, base_usd: reservas / base_usd * 100)
@@ -0,0 +1,158 @@
+# metrics.py
+
+import logging
+import os
+import threading
+import time
+from functools import wraps
+
+# --- Instrumentación de descargas ---
+# Cada fetcher instrumentado registra tiempo, bytes recibidos, filas devueltas,
+# reintentos HTTP y aciertos/fallos de caché. Los totales por serie se exponen
+# como tabla (resumen), en formato de texto de Prometheus (texto_prometheus, y
+# en METRICS_FILE si está definida) y como una línea de log por descarga.
+
+logger = logging.getLogger("bcra.metrics")
+
+METRICS_FILE = os.environ.get("METRICS_FILE")
+
+_local = threading.local()
+_lock = threading.Lock()
+_totales = {}  # (fuente, serie) -> dict de contadores
+# Las mediciones en curso se comparten con los hilos de propagar: se suman con lock
+_lock_mediciones = threading.Lock()
+
+
+def _pila():
+    if not hasattr(_local, "pila"):
+        _local.pila = []
+    return _local.pila
+
+
+def propagar(funcion):
+    # Envuelve funcion para que, ejecutada en otro hilo, sume a las mediciones en curso de este
+    pila = list(_pila())
+
+    @wraps(funcion)
+    def envuelta(*args, **kwargs):
+        _local.pila = list(pila)
+        return funcion(*args, **kwargs)
+    return envuelta
+
+
+def registrar_http(bytes_recibidos, reintentos):
+    pila = _pila()
+    if not pila:
+        return
+    with _lock_mediciones:
+        for medicion in pila:
+            medicion["bytes"] += bytes_recibidos
+            medicion["reintentos"] += reintentos
+            medicion["pedidos"] += 1
+
+
+def registrar_cache(acierto):
+    pila = _pila()
+    if not pila:
+        return
+    with _lock_mediciones:
+        for medicion in pila:
+            medicion["cache_hits" if acierto else "cache_misses"] += 1
+
+
+def instrumentar(fuente, serie=None):
+    # serie: nombre fijo o función de los argumentos (ej. lambda id_variable, *a: f"bcra_{id_variable}")
+    def decorador(funcion):
+        @wraps(funcion)
+        def envuelta(*args, **kwargs):
+            nombre = serie(*args, **kwargs) if callable(serie) else (serie or funcion.__name__)
+            medicion = {"pedidos": 0, "bytes": 0, "reintentos": 0, "cache_hits": 0, "cache_misses": 0}
+            pila = _pila()
+            pila.append(medicion)
+            inicio = time.perf_counter()
+            error = False
+            filas = 0
+            try:
+                resultado = funcion(*args, **kwargs)
+                filas = len(resultado) if hasattr(resultado, "__len__") else 0
+                return resultado
+            except Exception:
+                error = True
+                raise
+            finally:
+                pila.pop()
+                _acumular(fuente, nombre, time.perf_counter() - inicio, filas, error, medicion)
+        return envuelta
+    return decorador
+
+
+def _acumular(fuente, serie, segundos, filas, error, medicion):
+    with _lock_mediciones:
+        medicion = dict(medicion)
+    with _lock:
+        total = _totales.setdefault((fuente, serie), {
+            "llamadas": 0, "errores": 0, "segundos": 0.0, "ultimo_segundos": 0.0, "filas": 0,
+            "pedidos": 0, "bytes": 0, "reintentos": 0, "cache_hits": 0, "cache_misses": 0,
+        })
+        total["llamadas"] += 1
+        total["errores"] += int(error)
+        total["segundos"] += segundos
+        total["ultimo_segundos"] = segundos
+        total["filas"] += filas
+        for clave, valor in medicion.items():
+            total[clave] += valor
+
+    logger.info(
+        "fetch fuente=%s serie=%s ms=%.1f bytes=%d filas=%d pedidos=%d reintentos=%d cache_hits=%d cache_misses=%d error=%s",
+        fuente, serie, segundos * 1000, medicion["bytes"], filas, medicion["pedidos"],
+        medicion["reintentos"], medicion["cache_hits"], medicion["cache_misses"], error
+    )
+    if METRICS_FILE:
+        _escribir_archivo(METRICS_FILE)
+
+
+def resumen():
+    with _lock:
+        return [
+            {"fuente": fuente, "serie": serie, **total,
+             "ms_promedio": 1000 * total["segundos"] / total["llamadas"]}
+            for (fuente, serie), total in sorted(_totales.items())
+        ]
+
+
+def reiniciar():
+    with _lock:
+        _totales.clear()
+
+
+_METRICAS_PROMETHEUS = [
+    ("llamadas", "bcra_fetch_calls_total", "counter", "Llamadas a cada fetcher"),
+    ("errores", "bcra_fetch_errors_total", "counter", "Llamadas que terminaron en excepción"),
+    ("segundos", "bcra_fetch_seconds_total", "counter", "Tiempo total de descarga"),
+    ("ultimo_segundos", "bcra_fetch_last_seconds", "gauge", "Duración de la última llamada"),
+    ("filas", "bcra_fetch_rows_total", "counter", "Filas devueltas"),
+    ("pedidos", "bcra_fetch_http_requests_total", "counter", "Pedidos HTTP realizados"),
+    ("bytes", "bcra_fetch_response_bytes_total", "counter", "Bytes de respuesta recibidos"),
+    ("reintentos", "bcra_fetch_retries_total", "counter", "Reintentos HTTP"),
+    ("cache_hits", "bcra_fetch_cache_hits_total", "counter", "Aciertos de caché/almacén"),
+    ("cache_misses", "bcra_fetch_cache_misses_total", "counter", "Fallos de caché/almacén"),
+]
+
+
+def texto_prometheus():
+    filas = resumen()
+    lineas = []
+    for clave, nombre, tipo, ayuda in _METRICAS_PROMETHEUS:
+        lineas.append(f"# HELP {nombre} {ayuda}")
+        lineas.append(f"# TYPE {nombre} {tipo}")
+        for fila in filas:
+            lineas.append(f'{nombre}{{fuente="{fila["fuente"]}",serie="{fila["serie"]}"}} {fila[clave]}')
+    return "\n".join(lineas) + "\n"
+
+
+def _escribir_archivo(ruta):
+    # Escritura atómica para el textfile collector de node_exporter
+    temporal = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        f.write(texto_prometheus())
+    os.replace(temporal, ruta)
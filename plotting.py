@@ -1,16 +1,197 @@
 # plotting.py
 
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+import numpy as np
 import plotly.graph_objects as go
 import pandas as pd
 
-def plot_inflacion(df):
+from estadisticas import agregar_columnas
+import rollups
+
+# Máximo de puntos por traza. None envía la serie completa; se puede fijar con
+# PLOT_MAX_PUNTOS o por gráfico con el parámetro max_puntos.
+MAX_PUNTOS = int(os.environ["PLOT_MAX_PUNTOS"]) if os.environ.get("PLOT_MAX_PUNTOS") else None
+
+# Render de las trazas: "auto" usa WebGL (Scattergl) cuando una traza supera
+# WEBGL_UMBRAL puntos; "svg" o "webgl" lo fuerzan. Configurable con PLOT_RENDER
+# y PLOT_WEBGL_UMBRAL, o por gráfico con el parámetro render.
+RENDER = os.environ.get("PLOT_RENDER", "auto")
+WEBGL_UMBRAL = int(os.environ.get("PLOT_WEBGL_UMBRAL", 1000))
+
+# Resolución temporal: "auto" grafica el agregado de rollups.py más grueso que
+# encaje en el rango (último valor de cada semana, mes o trimestre); "D" la
+# serie original; "W", "M" o "Q" fijan la frecuencia. Configurable con
+# PLOT_FRECUENCIA o por gráfico con el parámetro frecuencia.
+FRECUENCIA = os.environ.get("PLOT_FRECUENCIA", "auto")
+
+# Columnas sobre las que cada gráfico calcula las estadísticas pedidas con el
+# parámetro estadisticas (ver estadisticas.py); None usa todas las de valores
+COLUMNAS_ESTADISTICAS = {
+    "plot_inflacion": ["valor"],
+    "plot_tasa_monetaria": ["valor"],
+    "plot_reservas": ["valor"],
+    "plot_tipo_cambio": ["usd_oficial", "usd_blue"],
+    "plot_cny": ["cny_oficial"],
+    "plot_merval": ["merval_usd"],
+    "plot_cedears": None,
+}
+
+# Figuras construidas que se reutilizan entre reruns mientras los datos no cambien
+FIGURAS_CACHE_MAX = int(os.environ.get("PLOT_CACHE_MAX", 64))
+
+# --- Caché de figuras por huella de datos ---
+
+_figuras = OrderedDict()
+_figuras_lock = threading.Lock()
+
+# attrs que leen las funciones de ploteo y que por lo tanto cambian la figura
+ATTRS_FIGURA = ("nombres", "ultima_fecha")
+
+def _huella(df):
+    # Hash del contenido en orden (vectorizado en pandas) más columnas, tipos y attrs usados
+    contenido = hashlib.blake2b(pd.util.hash_pandas_object(df).to_numpy().tobytes()).hexdigest()
+    attrs = tuple(
+        tuple(sorted(valor.items())) if isinstance(valor, dict) else valor
+        for valor in (df.attrs.get(nombre) for nombre in ATTRS_FIGURA)
+    )
+    return contenido, tuple(df.columns), tuple(map(str, df.dtypes)), attrs
+
+def figura_cacheada(funcion):
+    # Memoiza la figura por función, huella del DataFrame y configuración de ploteo
+    @wraps(funcion)
+    def envuelta(df, frecuencia=None, estadisticas=None, **kwargs):
+        frecuencia = frecuencia or FRECUENCIA
+        estadisticas = tuple(estadisticas or ())
+        clave = (funcion.__name__, _huella(df), tuple(sorted(kwargs.items())), frecuencia, estadisticas,
+                 MAX_PUNTOS, RENDER, WEBGL_UMBRAL)
+        with _figuras_lock:
+            fig = _figuras.get(clave)
+            if fig is not None:
+                _figuras.move_to_end(clave)
+                return fig
+        # Las estadísticas se calculan sobre la serie original y se agregan junto con ella
+        columnas = COLUMNAS_ESTADISTICAS.get(funcion.__name__) or [c for c in df.columns if c != "fecha"]
+        completo = agregar_columnas(funcion.__name__, df, columnas, estadisticas)
+        completo = _resolucion(funcion.__name__, completo, frecuencia)
+        base = completo[list(df.columns)]
+        base.attrs = dict(df.attrs)
+        if len(df):
+            # En un agregado "fecha" es el inicio del período: el titular usa el último día real
+            base.attrs["ultima_fecha"] = df["fecha"].max()
+        fig = funcion(base, **kwargs)
+        _trazar_estadisticas(fig, completo, columnas, estadisticas, kwargs.get("max_puntos"), kwargs.get("render"))
+        with _figuras_lock:
+            _figuras[clave] = fig
+            while len(_figuras) > FIGURAS_CACHE_MAX:
+                _figuras.popitem(last=False)
+        return fig
+    return envuelta
+
+# --- Resolución temporal ---
+
+def _resolucion(nombre, df, frecuencia):
+    # La serie al nivel de agregación pedido, con las mismas columnas (último valor del período)
+    if frecuencia == "auto":
+        frecuencia = rollups.elegir_frecuencia(df["fecha"]) if "fecha" in df.columns else None
+    if frecuencia in (None, "D"):
+        return df
+    agregado = None
+    if df.attrs.get("serie") and len(df) and list(df.columns) == ["fecha", "valor"]:
+        # Una serie del almacén tal cual: se usa el agregado que mantiene la capa de datos
+        agregado = rollups.agregado_almacenado(df.attrs["serie"], df, frecuencia)
+    if agregado is None:
+        agregado = rollups.get_rollup((nombre, tuple(df.columns)), df, frecuencia)
+    reducido = agregado[list(df.columns)]
+    reducido.attrs = dict(df.attrs)
+    return reducido
+
+# --- Estadísticas ---
+
+# Las medias móviles comparten eje con la serie; variaciones y volatilidad van al eje derecho
+_ETIQUETAS = {"mom": "var. mensual %", "yoy": "var. interanual %", "yoy_compuesta": "interanual %",
+              "acumulada": "acumulada %", "sma": "media", "vol": "volatilidad %"}
+
+def _trazar_estadisticas(fig, df, columnas, nombres, max_puntos=None, render=None):
+    if not nombres:
+        return
+    nombres_series = df.attrs.get("nombres", {})
+    eje_derecho = False
+    for columna in columnas:
+        for nombre in nombres:
+            tipo, _, parametro = nombre.partition("_") if nombre.startswith(("sma_", "vol_")) else (nombre, "", "")
+            mismo_eje = tipo == "sma"
+            eje_derecho |= not mismo_eje
+            fig.add_trace(trazo(
+                **_puntos(df, f"{columna}_{nombre}", max_puntos),
+                render=render,
+                mode="lines",
+                connectgaps=True,
+                name=f"{'' if columna == 'valor' else nombres_series.get(columna, columna)} {_ETIQUETAS[tipo]} {parametro}".strip(),
+                yaxis="y" if mismo_eje else "y2",
+                line=dict(width=1.5, dash="dot")
+            ))
+    if eje_derecho:
+        fig.update_layout(yaxis2=dict(overlaying="y", side="right", showgrid=False, tickfont=dict(color="white")))
+
+# --- Trazas SVG / WebGL ---
+
+def trazo(x, y, render=None, **kwargs):
+    # go.Scatter o go.Scattergl (mismos argumentos de estilo) según el modo y la cantidad de puntos
+    render = render or RENDER
+    webgl = render == "webgl" or (render == "auto" and len(x) > WEBGL_UMBRAL)
+    return (go.Scattergl if webgl else go.Scatter)(x=x, y=y, **kwargs)
+
+# --- Reducción de puntos (Largest-Triangle-Three-Buckets) ---
+
+def lttb(x, y, n):
+    # Índices de los n puntos que mejor preservan la forma de (x, y).
+    # Siempre conserva el primero y el último.
+    largo = len(x)
+    if n is None or n >= largo or n < 3:
+        return np.arange(largo)
+
+    bordes = np.linspace(1, largo - 1, n - 1).astype(np.intp)
+    indices = np.empty(n, dtype=np.intp)
+    indices[0], indices[-1] = 0, largo - 1
+    a = 0
+    for i in range(n - 2):
+        inicio, fin = bordes[i], bordes[i + 1]
+        sig_fin = bordes[i + 2] if i + 2 < n - 1 else largo
+        promedio_x = x[fin:sig_fin].mean()
+        promedio_y = y[fin:sig_fin].mean()
+        area = np.abs((x[a] - promedio_x) * (y[inicio:fin] - y[a])
+                      - (x[a] - x[inicio:fin]) * (promedio_y - y[a]))
+        a = inicio + int(np.argmax(area))
+        indices[i + 1] = a
+    return indices
+
+def _puntos(df, columna, max_puntos=None):
+    # x/y de una traza, reducidos con LTTB si superan max_puntos
+    max_puntos = max_puntos or MAX_PUNTOS
+    if not max_puntos or len(df) <= max_puntos:
+        return dict(x=df["fecha"], y=df[columna])
+    serie = df[["fecha", columna]].dropna()
+    x = serie["fecha"].to_numpy(dtype="datetime64[ns]").astype(np.int64).astype(float)
+    indices = lttb(x, serie[columna].to_numpy(dtype=float), max_puntos)
+    return dict(x=serie["fecha"].iloc[indices], y=serie[columna].iloc[indices])
+
+def _ultimo_mes(df):
+    return df.attrs.get("ultima_fecha", df["fecha"].iloc[-1]).strftime("%B %Y")
+
+@figura_cacheada
+def plot_inflacion(df, max_puntos=None, render=None):
     ultimo_valor = df["valor"].dropna().iloc[-1]
-    ultimo_mes = df["fecha"].dt.strftime("%B %Y").iloc[-1]
+    ultimo_mes = _ultimo_mes(df)
 
     fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=df["fecha"],
-        y=df["valor"],
+    fig.add_trace(trazo(
+        **_puntos(df, "valor", max_puntos),
+        render=render,
         fill="tozeroy",
         mode="lines",
         connectgaps=True,
@@ -19,14 +200,15 @@ def plot_inflacion(df):
     fig.update_layout(**layout_config("Inflación mensual", ultimo_mes, f"{ultimo_valor:.1f} %"))
     return fig
 
-def plot_tasa_monetaria(df):
+@figura_cacheada
+def plot_tasa_monetaria(df, max_puntos=None, render=None):
     ultimo_valor = df["valor"].dropna().iloc[-1]
-    ultimo_mes = df["fecha"].dt.strftime("%B %Y").iloc[-1]
+    ultimo_mes = _ultimo_mes(df)
 
     fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=df["fecha"],
-        y=df["valor"],
+    fig.add_trace(trazo(
+        **_puntos(df, "valor", max_puntos),
+        render=render,
         fill="tozeroy",
         mode="lines",
         connectgaps=True,
@@ -35,15 +217,16 @@ def plot_tasa_monetaria(df):
     fig.update_layout(**layout_config("Tasa de Política Monetaria", ultimo_mes, f"{ultimo_valor:.1f} %"))
     return fig
 
-def plot_reservas(df):
-    df["reservas"] = df["valor"] / 1000
+@figura_cacheada
+def plot_reservas(df, max_puntos=None, render=None):
+    df = df.assign(reservas=df["valor"] / 1000)
     ultimo_valor = df["reservas"].dropna().iloc[-1]
-    ultimo_mes = df["fecha"].dt.strftime("%B %Y").iloc[-1]
+    ultimo_mes = _ultimo_mes(df)
 
     fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=df["fecha"],
-        y=df["reservas"],
+    fig.add_trace(trazo(
+        **_puntos(df, "reservas", max_puntos),
+        render=render,
         fill="tozeroy",
         mode="lines",
         connectgaps=True,
@@ -52,24 +235,25 @@ def plot_reservas(df):
     fig.update_layout(**layout_config("Reservas Internacionales", ultimo_mes, f"{ultimo_valor:.1f} B"))
     return fig
 
-def plot_tipo_cambio(df):
+@figura_cacheada
+def plot_tipo_cambio(df, max_puntos=None, render=None):
     ultimo_usd_oficial = df["usd_oficial"].dropna().iloc[-1]
     ultimo_usd_blue = df["usd_blue"].dropna().iloc[-1]
-    ultimo_mes = df["fecha"].dt.strftime("%B %Y").iloc[-1]
+    ultimo_mes = _ultimo_mes(df)
 
     fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=df["fecha"],
-        y=df["usd_oficial"],
+    fig.add_trace(trazo(
+        **_puntos(df, "usd_oficial", max_puntos),
+        render=render,
         fill="tozeroy",
         mode="lines",
         connectgaps=True,
         line=dict(color="#2ECC71", width=3),
         name="USD Oficial"
     ))
-    fig.add_trace(go.Scatter(
-        x=df["fecha"],
-        y=df["usd_blue"],
+    fig.add_trace(trazo(
+        **_puntos(df, "usd_blue", max_puntos),
+        render=render,
         mode="lines",
         connectgaps=True,
         line=dict(color="#2ECC71", width=3, dash="dot"),
@@ -78,14 +262,15 @@ def plot_tipo_cambio(df):
     fig.update_layout(**layout_config("Tipo de Cambio (USD Oficial y Blue)", ultimo_mes, f"Oficial: {ultimo_usd_oficial:.0f} | Blue: {ultimo_usd_blue:.0f}"))
     return fig
 
-def plot_cny(df):
+@figura_cacheada
+def plot_cny(df, max_puntos=None, render=None):
     ultimo_valor = df["cny_oficial"].dropna().iloc[-1]
-    ultimo_mes = df["fecha"].dt.strftime("%B %Y").iloc[-1]
+    ultimo_mes = _ultimo_mes(df)
 
     fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=df["fecha"],
-        y=df["cny_oficial"],
+    fig.add_trace(trazo(
+        **_puntos(df, "cny_oficial", max_puntos),
+        render=render,
         fill="tozeroy",
         mode="lines",
         connectgaps=True,
@@ -94,13 +279,14 @@ def plot_cny(df):
     fig.update_layout(**layout_config("Tipo de Cambio (CNY/ARS)", ultimo_mes, f"{ultimo_valor:.1f}"))
     return fig
 
-def plot_merval(df):
+@figura_cacheada
+def plot_merval(df, max_puntos=None, render=None):
     if df.empty or "fecha" not in df.columns or "merval_usd" not in df.columns:
         return go.Figure()
     fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=df["fecha"],
-        y=df["merval_usd"],
+    fig.add_trace(trazo(
+        **_puntos(df, "merval_usd", max_puntos),
+        render=render,
         fill="tozeroy",
         mode="lines",
         connectgaps=True,
@@ -108,18 +294,21 @@ def plot_merval(df):
     ))
     return fig
 
-def plot_cedears(df):
-    cedears = {"YPFD.BA": "YPF", "GGAL.BA": "Galicia", "BMA.BA": "Banco Macro", "MELI.BA": "MercadoLibre"}
-    colors = ["#FF5733", "#1E90FF", "#2ECC71", "#7FDBFF"]
+@figura_cacheada
+def plot_cedears(df, max_puntos=None, render=None):
+    # Una traza por columna de tickers; los nombres vienen de attrs["nombres"] (get_cedears)
+    nombres = df.attrs.get("nombres", {})
+    tickers = [columna for columna in df.columns if columna != "fecha"]
+    colors = ["#FF5733", "#1E90FF", "#2ECC71", "#7FDBFF", "#F1C40F", "#9B59B6", "#E67E22", "#1ABC9C"]
 
     fig = go.Figure()
-    for i, (ticker, name) in enumerate(cedears.items()):
-        fig.add_trace(go.Scatter(
-            x=df["fecha"],
-            y=df[ticker],
+    for i, ticker in enumerate(tickers):
+        fig.add_trace(trazo(
+            **_puntos(df, ticker, max_puntos),
+            render=render,
             mode="lines",
             connectgaps=True,
-            name=name,
+            name=nombres.get(ticker, ticker),
             line=dict(width=2, color=colors[i % len(colors)])
         ))
     fig.update_layout(
@@ -0,0 +1,141 @@
+# prefetch.py
+#
+# Proceso sin interfaz que mantiene caliente el almacén local (series_store)
+# con todas las series que usan app.py y las apps de streamlit/, para que el
+# primer visitante del día no espere a BCRA, Bluelytics ni Yahoo.
+#
+#   python -m prefetch                              # cada PREFETCH_INTERVALO segundos
+#   python -m prefetch --horarios 09:30,13:00,18:30 # a horas fijas (hora local)
+#   python -m prefetch --una-vez                    # una pasada y termina (para cron)
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import catalogo
+import data_fetching
+import series_store
+
+logger = logging.getLogger("prefetch")
+
+PREFETCH_DESDE = os.environ.get("PREFETCH_DESDE", "2020-01-01")
+PREFETCH_INTERVALO = int(os.environ.get("PREFETCH_INTERVALO", 3600))
+
+# Variables del BCRA que usan las apps: nombre -> id
+VARIABLES = {"reservas": 1, "tasa_monetaria": 6, "inflacion": 27, "base_monetaria": 15}
+
+
+def _variable(id_variable):
+    return lambda desde, hasta, refresco: data_fetching.get_bcra_variable(id_variable, desde, hasta, refresco)
+
+
+# nombre -> fetcher(start_date, end_date, refresco). La pasada pide con
+# refresco=0: la cola de cada serie se consulta aunque no haya vencido.
+SERIES = {
+    **{nombre: _variable(id_variable) for nombre, id_variable in VARIABLES.items()},
+    "usd_oficial": data_fetching.get_usd_oficial,
+    "cny_oficial": data_fetching.get_cny_oficial,
+    "usd_blue": lambda desde, hasta, refresco: data_fetching.actualizar_usd_blue(),
+    "merval_ars": data_fetching.get_merval_ars,
+    "cedears": lambda desde, hasta, refresco: data_fetching.get_cedears(desde, hasta, refresco=refresco),
+    "catalogo": lambda desde, hasta, refresco: catalogo.actualizar(),
+}
+
+
+def _series_pasada():
+    # SERIES más las variables del BCRA que ya están en el almacén porque las
+    # pidió alguna app (ej. las elegidas en el selector de streamlit/app.py)
+    series = dict(SERIES)
+    for clave in series_store.claves():
+        id_variable = clave[len("bcra_"):]
+        if clave.startswith("bcra_") and id_variable.isdigit() and int(id_variable) not in VARIABLES.values():
+            series[clave] = _variable(int(id_variable))
+    return series
+
+
+def _precargar(nombre, fetcher, desde, hasta, jitter):
+    # Espera aleatoria para no disparar todos los pedidos a la vez
+    time.sleep(random.uniform(0, jitter))
+    inicio = time.perf_counter()
+    estado = {"inicio": datetime.datetime.now().isoformat(timespec="seconds")}
+    try:
+        df = fetcher(desde, hasta, 0)
+        estado.update(ok=True, filas=len(df))
+    except Exception as e:
+        logger.warning("Falló la precarga de %s: %s", nombre, e)
+        estado.update(ok=False, error=str(e))
+    estado["segundos"] = round(time.perf_counter() - inicio, 3)
+    return nombre, estado
+
+
+def ejecutar_pasada(max_workers=4, jitter=0.0, desde=PREFETCH_DESDE):
+    hasta = datetime.date.today().isoformat()
+    series = _series_pasada()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futuros = [pool.submit(_precargar, nombre, fetcher, desde, hasta, jitter) for nombre, fetcher in series.items()]
+        return dict(f.result() for f in futuros)
+
+
+def escribir_estado(ruta, series, proxima):
+    estado = {
+        "actualizado": datetime.datetime.now().isoformat(timespec="seconds"),
+        "proxima_pasada": proxima.isoformat(timespec="seconds") if proxima else None,
+        "series": series,
+    }
+    temporal = f"{ruta}.tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(estado, f, indent=2, ensure_ascii=False)
+    os.replace(temporal, ruta)
+
+
+def proxima_ejecucion(ahora, intervalo, horarios, jitter):
+    if horarios:
+        candidatos = []
+        for horario in horarios:
+            hora, minuto = map(int, horario.split(":"))
+            momento = ahora.replace(hour=hora, minute=minuto, second=0, microsecond=0)
+            if momento <= ahora:
+                momento += datetime.timedelta(days=1)
+            candidatos.append(momento)
+        base = min(candidatos)
+    else:
+        base = ahora + datetime.timedelta(seconds=intervalo)
+    return base + datetime.timedelta(seconds=random.uniform(0, jitter))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precarga periódica del almacén de series")
+    parser.add_argument("--intervalo", type=int, default=PREFETCH_INTERVALO, help="segundos entre pasadas")
+    parser.add_argument("--horarios", help="horas fijas HH:MM separadas por coma (reemplaza --intervalo)")
+    parser.add_argument("--jitter", type=float, default=60.0, help="segundos aleatorios extra por pasada y serie")
+    parser.add_argument("--max-workers", type=int, default=4, help="series descargadas a la vez")
+    parser.add_argument("--desde", default=PREFETCH_DESDE)
+    parser.add_argument("--estado", default=os.path.join(series_store.STORE_DIR, "prefetch_status.json"))
+    parser.add_argument("--una-vez", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    os.makedirs(os.path.dirname(os.path.abspath(args.estado)), exist_ok=True)
+    horarios = args.horarios.split(",") if args.horarios else None
+
+    while True:
+        series = ejecutar_pasada(args.max_workers, args.jitter, args.desde)
+        correctas = sum(estado["ok"] for estado in series.values())
+        logger.info("Pasada completa: %d/%d series actualizadas", correctas, len(series))
+
+        proxima = None if args.una_vez else proxima_ejecucion(
+            datetime.datetime.now(), args.intervalo, horarios, args.jitter
+        )
+        escribir_estado(args.estado, series, proxima)
+        if proxima is None:
+            break
+        time.sleep(max(0.0, (proxima - datetime.datetime.now()).total_seconds()))
+
+
+if __name__ == "__main__":
+    main()
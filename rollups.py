@@ -0,0 +1,152 @@
+# rollups.py
+
+import hashlib
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+import series_store
+
+# --- Agregados por período ---
+# Para rangos largos no hace falta graficar cada día: se mantienen agregados
+# semanales, mensuales y trimestrales de cada serie (último valor, media,
+# mínimo y máximo), fechados al inicio del período. Se actualizan en forma
+# incremental: cuando llegan días nuevos solo se recalcula desde el último
+# período guardado, que pudo haber quedado incompleto. Si cambiaron filas
+# anteriores (se llenó un hueco o se revisó un valor) se recalcula todo.
+#
+# data_fetching llama a actualizar cada vez que guarda datos de una serie en
+# el almacén (series_store), así los agregados de la serie completa se
+# mantienen al día junto con ella; agregado_almacenado los recorta a un rango.
+
+# Frecuencias de la más gruesa a la más fina, con los días promedio por período
+FRECUENCIAS = {"Q": 91.3, "M": 30.4, "W": 7.0}
+
+# Puntos mínimos que debe tener una serie agregada para preferirla a la diaria
+ROLLUP_MIN_PUNTOS = int(os.environ.get("ROLLUP_MIN_PUNTOS", 120))
+
+_SUFIJOS = {"last": "", "mean": "_media", "min": "_min", "max": "_max"}
+
+_cache = {}  # (clave, frecuencia, columnas) -> (primera fecha, última fecha, huella, agregado indexado por período)
+_lock = threading.Lock()
+
+
+def _columnas_valor(df):
+    return [c for c in df.columns if c != "fecha" and pd.api.types.is_numeric_dtype(df[c])]
+
+
+def _agregar(df, frecuencia, columnas):
+    periodos = df["fecha"].dt.to_period(frecuencia).rename("periodo")
+    agregado = df[columnas].groupby(periodos).agg(list(_SUFIJOS))
+    agregado.columns = [f"{columna}{_SUFIJOS[funcion]}" for columna, funcion in agregado.columns]
+    return agregado
+
+
+def _a_frame(agregado):
+    df = agregado.reset_index(drop=True)
+    df.insert(0, "fecha", agregado.index.start_time)
+    return df
+
+
+def agregar(df, frecuencia, columnas=None):
+    # df: frame con "fecha" ordenada. Devuelve una fila por período con fecha de
+    # inicio, cada columna con su último valor y columna_media/_min/_max
+    columnas = columnas or _columnas_valor(df)
+    return _a_frame(_agregar(df, frecuencia, columnas))
+
+
+def _huella(df):
+    # Hash del contenido en orden: detecta filas agregadas, quitadas o revisadas
+    return hashlib.blake2b(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes()).hexdigest()
+
+
+def _rollup(clave, df, frecuencia, columnas):
+    # Agregado indexado por período, memorizado por clave. Se reutiliza lo ya
+    # agregado si df empieza en la misma fecha y las filas anteriores al último
+    # período guardado no cambiaron (la huella se guarda junto al agregado)
+    desde, hasta = df["fecha"].iloc[0], df["fecha"].iloc[-1]
+    entrada = (clave, frecuencia, tuple(columnas))
+    with _lock:
+        previo = _cache.get(entrada)
+
+    agregado = None
+    if previo is not None and previo[0] == desde and previo[1] <= hasta and len(previo[3]):
+        _, _, huella, anterior = previo
+        ultimo = anterior.index[-1]
+        corte = df["fecha"].searchsorted(ultimo.start_time)
+        if _huella(df.iloc[:corte][["fecha", *columnas]]) == huella:
+            nuevos = _agregar(df.iloc[corte:], frecuencia, columnas)
+            agregado = pd.concat([anterior[anterior.index < ultimo], nuevos])
+    if agregado is None:
+        agregado = _agregar(df, frecuencia, columnas)
+
+    corte = df["fecha"].searchsorted(agregado.index[-1].start_time)
+    huella = _huella(df.iloc[:corte][["fecha", *columnas]])
+    with _lock:
+        _cache[entrada] = (desde, hasta, huella, agregado)
+    return agregado
+
+
+def get_rollup(clave, df, frecuencia):
+    # Como agregar, pero memorizado por clave: si df es la misma serie extendida
+    # hacia adelante solo se agregan los períodos nuevos
+    if df.empty:
+        return agregar(df, frecuencia)
+    return _a_frame(_rollup(clave, df, frecuencia, _columnas_valor(df)))
+
+
+# --- Agregados de las series del almacén ---
+
+
+def actualizar(clave):
+    # Pone al día los agregados de la serie completa del almacén en todas las frecuencias
+    df = series_store.leer(clave)
+    if not df.empty:
+        for frecuencia in FRECUENCIAS:
+            _rollup(("almacen", clave), df, frecuencia, ["valor"])
+
+
+def agregado_almacenado(clave, df, frecuencia):
+    # df: un rango (fecha/valor) de la serie clave tal como se leyó del almacén.
+    # Los períodos interiores salen del agregado de la serie completa y los de
+    # los bordes, que el rango puede cortar, se calculan con las filas de df.
+    # None si el almacén ya no coincide con df (ej. se actualizó después).
+    completo = series_store.leer(clave)
+    rango = completo[completo["fecha"].between(df["fecha"].iloc[0], df["fecha"].iloc[-1])]
+    if len(rango) != len(df) or not (
+        np.array_equal(rango["fecha"].to_numpy(), df["fecha"].to_numpy())
+        and np.allclose(rango["valor"].to_numpy(), df["valor"].to_numpy(dtype=float), rtol=1e-6, equal_nan=True)
+    ):
+        return None
+
+    agregado = _rollup(("almacen", clave), completo, frecuencia, ["valor"])
+    periodos = df["fecha"].dt.to_period(frecuencia)
+    primero, ultimo = periodos.iloc[0], periodos.iloc[-1]
+    bordes = _agregar(df[periodos.isin([primero, ultimo])], frecuencia, ["valor"])
+    interior = agregado[(agregado.index > primero) & (agregado.index < ultimo)]
+    return _a_frame(pd.concat([bordes.iloc[:1], interior, bordes.iloc[1:]]))
+
+
+def elegir_frecuencia(fechas, min_puntos=None):
+    # La frecuencia más gruesa que todavía deja min_puntos períodos en el rango
+    # y reduce la cantidad de puntos; None si conviene la serie original
+    min_puntos = ROLLUP_MIN_PUNTOS if min_puntos is None else min_puntos
+    if len(fechas) < 2:
+        return None
+    dias = (fechas.iloc[-1] - fechas.iloc[0]).days + 1
+    for frecuencia, dias_periodo in FRECUENCIAS.items():
+        periodos = dias / dias_periodo
+        if min_puntos <= periodos < len(fechas):
+            return frecuencia
+    return None
+
+
+def invalidar(clave=None):
+    with _lock:
+        if clave is None:
+            _cache.clear()
+        else:
+            for entrada in [e for e in _cache if e[0] == clave]:
+                del _cache[entrada]
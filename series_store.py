@@ -0,0 +1,124 @@
+# series_store.py
+
+import os
+import sqlite3
+import time
+import datetime
+import pandas as pd
+
+# --- Almacén local de series de tiempo ---
+# Una base SQLite por serie (ej. "bcra_1") con las observaciones ya descargadas
+# y la cobertura consultada, para pedir a la API solo las fechas que faltan.
+
+STORE_DIR = os.environ.get(
+    "BCRA_STORE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".bcra_store")
+)
+
+# Cada cuánto se vuelve a consultar la cola de una serie (datos nuevos)
+REFRESCO_SEGUNDOS = int(os.environ.get("BCRA_STORE_REFRESH", 3600))
+
+# Días antes de la última observación que se vuelven a pedir con la cola: las
+# fuentes publican valores provisorios que corrigen en los días siguientes
+REVISION_DIAS = int(os.environ.get("BCRA_STORE_REVISION_DIAS", 7))
+
+
+def _conectar(clave):
+    os.makedirs(STORE_DIR, exist_ok=True)
+    con = sqlite3.connect(os.path.join(STORE_DIR, f"{clave}.sqlite"), timeout=30)
+    con.execute("CREATE TABLE IF NOT EXISTS observaciones (fecha TEXT PRIMARY KEY, valor REAL)")
+    con.execute(
+        "CREATE TABLE IF NOT EXISTS cobertura ("
+        "id INTEGER PRIMARY KEY CHECK (id = 0), desde TEXT, consultado_hasta TEXT, verificado REAL)"
+    )
+    return con
+
+
+def _dia(fecha, delta):
+    return (datetime.date.fromisoformat(fecha) + datetime.timedelta(days=delta)).isoformat()
+
+
+def cobertura(clave):
+    con = _conectar(clave)
+    try:
+        fila = con.execute("SELECT desde, consultado_hasta, verificado FROM cobertura WHERE id = 0").fetchone()
+        if fila is None:
+            return None
+        ultimo = con.execute("SELECT MAX(fecha) FROM observaciones").fetchone()[0]
+        return {"desde": fila[0], "consultado_hasta": fila[1], "verificado": fila[2], "ultimo": ultimo}
+    finally:
+        con.close()
+
+
+def rangos_faltantes(clave, desde, hasta, refresco=None):
+    # Devuelve los intervalos (desde, hasta) que hay que pedir a la API.
+    # Los rangos quedan contiguos a la cobertura para no dejar huecos; la cola
+    # vuelve a pedir los últimos REVISION_DIAS días almacenados por si eran
+    # datos provisorios.
+    refresco = REFRESCO_SEGUNDOS if refresco is None else refresco
+    cob = cobertura(clave)
+    if cob is None:
+        return [(desde, hasta)]
+
+    faltantes = []
+    if desde < cob["desde"]:
+        faltantes.append((desde, _dia(cob["desde"], -1)))
+
+    inicio_cola = max(_dia(cob["ultimo"], -REVISION_DIAS), cob["desde"]) if cob["ultimo"] else cob["desde"]
+    vencido = time.time() - cob["verificado"] >= refresco
+    if hasta >= inicio_cola and (hasta > cob["consultado_hasta"] or vencido):
+        faltantes.append((inicio_cola, hasta))
+    return faltantes
+
+
+def guardar(clave, df, desde, hasta):
+    # Incorpora las observaciones de df (columnas fecha/valor) y extiende la cobertura
+    registros = []
+    if not df.empty:
+        fechas = pd.to_datetime(df["fecha"]).dt.strftime("%Y-%m-%d")
+        registros = list(zip(fechas, df["valor"].astype(float)))
+
+    con = _conectar(clave)
+    try:
+        with con:
+            con.executemany("INSERT OR REPLACE INTO observaciones (fecha, valor) VALUES (?, ?)", registros)
+            fila = con.execute("SELECT desde, consultado_hasta, verificado FROM cobertura WHERE id = 0").fetchone()
+            verificado = time.time()
+            if fila is not None:
+                # Completar el principio de la serie no cuenta como verificar la cola
+                if hasta < fila[1]:
+                    verificado = fila[2]
+                desde = min(desde, fila[0])
+                hasta = max(hasta, fila[1])
+            con.execute(
+                "INSERT OR REPLACE INTO cobertura (id, desde, consultado_hasta, verificado) VALUES (0, ?, ?, ?)",
+                (desde, hasta, verificado)
+            )
+    finally:
+        con.close()
+
+
+def claves():
+    # Series con datos en el almacén
+    if not os.path.isdir(STORE_DIR):
+        return []
+    return sorted(nombre[:-len(".sqlite")] for nombre in os.listdir(STORE_DIR) if nombre.endswith(".sqlite"))
+
+
+def vigente(clave, segundos):
+    # True si la serie se verificó contra la fuente hace menos de `segundos`
+    cob = cobertura(clave)
+    return cob is not None and time.time() - cob["verificado"] < segundos
+
+
+def leer(clave, desde="0001-01-01", hasta="9999-12-31"):
+    con = _conectar(clave)
+    try:
+        df = pd.read_sql_query(
+            "SELECT fecha, valor FROM observaciones WHERE fecha BETWEEN ? AND ? ORDER BY fecha",
+            con, params=(desde, hasta)
+        )
+    finally:
+        con.close()
+    df["fecha"] = pd.to_datetime(df["fecha"])
+    return df
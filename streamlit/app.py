@@ -1,26 +1,31 @@
 import streamlit as st
-import requests
 import pandas as pd
 import plotly.graph_objects as go
 from datetime import datetime
+import sys
+from pathlib import Path
+
+# Módulos compartidos de la raíz del repositorio
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from plotting import trazo
+from catalogo import get_catalogo
+from data_fetching import get_bcra_variable, get_usd_oficial
 
 st.title("Comparativa: Variable Monetaria vs Tipo de Cambio USD (BCRA)")
 
 # =============================
 # OBTENER VARIABLES DISPONIBLES
 # =============================
-url_var_info = "https://api.bcra.gob.ar/estadisticas/v3.0/monetarias"
-res_info = requests.get(url_var_info, verify=False)
-
-if res_info.status_code != 200:
-    st.stop("No se pudieron obtener las variables disponibles desde la API del BCRA.")
-
-df_info = pd.DataFrame(res_info.json()["results"])
-df_info = df_info.sort_values("descripcion")
+# Catálogo persistido con TTL; no descarga en cada rerun
+try:
+    catalogo = get_catalogo()
+except Exception:
+    st.error("No se pudieron obtener las variables disponibles desde la API del BCRA.")
+    st.stop()
 
 # Selección de variable desde selectbox
-descripcion_seleccionada = st.selectbox("Seleccioná una variable monetaria", df_info["descripcion"])
-id_variable = df_info[df_info["descripcion"] == descripcion_seleccionada].iloc[0]["idVariable"]
+descripcion_seleccionada = st.selectbox("Seleccioná una variable monetaria", catalogo.descripciones)
+id_variable = catalogo.id_de(descripcion_seleccionada)
 
 # =============================
 # SELECCIÓN DE FECHAS
@@ -36,43 +41,25 @@ if fecha_inicio > fecha_fin:
 # =============================
 # CARGAR VARIABLE MONETARIA
 # =============================
-url_data = f"https://api.bcra.gob.ar/estadisticas/v3.0/monetarias/{id_variable}"
-params = {"desde": fecha_inicio.strftime("%Y-%m-%d"), "hasta": fecha_fin.strftime("%Y-%m-%d"), "limit": 3000}
-r = requests.get(url_data, params=params, verify=False)
-
-if r.status_code != 200:
-    st.stop("Error al obtener los datos de la variable monetaria.")
+# Desde el almacén local (series_store): solo se piden a la API las fechas que faltan
+try:
+    df_v = get_bcra_variable(id_variable, fecha_inicio.strftime("%Y-%m-%d"), fecha_fin.strftime("%Y-%m-%d"))
+except Exception:
+    st.error("Error al obtener los datos de la variable monetaria.")
+    st.stop()
 
-data = r.json()["results"]
-df_v = pd.DataFrame(data)
-df_v["fecha"] = pd.to_datetime(df_v["fecha"])
 df_v = df_v[["fecha", "valor"]].rename(columns={"valor": "valor_variable"})
 
 # =============================
 # COTIZACIÓN USD
 # =============================
-url_usd = "https://api.bcra.gob.ar/estadisticascambiarias/v1.0/Cotizaciones/USD"
-params_usd = {
-    "fechadesde": fecha_inicio.strftime("%Y-%m-%d"),
-    "fechahasta": fecha_fin.strftime("%Y-%m-%d"),
-    "limit": 1000
-}
-r_usd = requests.get(url_usd, params=params_usd, verify=False)
-
-if r_usd.status_code != 200:
-    st.stop("Error al obtener el tipo de cambio USD.")
-
-data_usd = r_usd.json()["results"]
-usd_registros = []
-for dia in data_usd:
-    fecha = dia["fecha"]
-    for cot in dia["detalle"]:
-        if isinstance(cot["tipoCotizacion"], (int, float)):
-            usd_registros.append({"fecha": fecha, "tipoCotizacion": cot["tipoCotizacion"]})
-
-df_usd = pd.DataFrame(usd_registros)
-df_usd["fecha"] = pd.to_datetime(df_usd["fecha"])
-df_usd = df_usd.groupby("fecha").mean(numeric_only=True).reset_index()
+try:
+    df_usd = get_usd_oficial(fecha_inicio.strftime("%Y-%m-%d"), fecha_fin.strftime("%Y-%m-%d"))
+except Exception:
+    st.error("Error al obtener el tipo de cambio USD.")
+    st.stop()
+
+df_usd = df_usd.rename(columns={"usd_oficial": "tipoCotizacion"})
 
 # =============================
 # UNIR DATOS
@@ -86,7 +73,7 @@ if df.empty:
 # =============================
 fig = go.Figure()
 
-fig.add_trace(go.Scatter(
+fig.add_trace(trazo(
     x=df["fecha"],
     y=df["valor_variable"],
     mode='lines',
@@ -94,7 +81,7 @@ fig.add_trace(go.Scatter(
     yaxis="y1"
 ))
 
-fig.add_trace(go.Scatter(
+fig.add_trace(trazo(
     x=df["fecha"],
     y=df["tipoCotizacion"],
     mode='lines',
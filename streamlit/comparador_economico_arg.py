@@ -1,10 +1,17 @@
 
 import streamlit as st
 import pandas as pd
-import requests
 from datetime import datetime
 import plotly.graph_objects as go
-import yfinance as yf
+import sys
+from pathlib import Path
+
+# Módulos compartidos de la raíz del repositorio
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from catalogo import get_catalogo
+from data_fetching import get_indicadores
+from estadisticas import correlaciones, correlaciones_cruzadas, normalizar, transformar
+from plotting import trazo
 
 st.title("Comparador de Variables Económicas Argentinas")
 
@@ -17,102 +24,115 @@ if fecha_inicio > fecha_fin:
     st.stop()
 
 # ============ FUNCIONES =============
-@st.cache_data
-def get_bcra_vars():
-    url = "https://api.bcra.gob.ar/estadisticas/v3.0/monetarias"
-    r = requests.get(url, verify=False)
-    return pd.DataFrame(r.json()["results"]) if r.status_code == 200 else None
-
-def get_bcra_variable(id_variable):
-    url = f"https://api.bcra.gob.ar/estadisticas/v3.0/monetarias/{id_variable}"
-    params = {"desde": fecha_inicio.strftime("%Y-%m-%d"), "hasta": fecha_fin.strftime("%Y-%m-%d"), "limit": 3000}
-    r = requests.get(url, params=params, verify=False)
-    df = pd.DataFrame(r.json()["results"])
-    df["fecha"] = pd.to_datetime(df["fecha"])
-    return df[["fecha", "valor"]].rename(columns={"valor": f"var_{id_variable}"})
-
-def get_usd_oficial():
-    url = "https://api.bcra.gob.ar/estadisticascambiarias/v1.0/Cotizaciones/USD"
-    params = {"fechadesde": fecha_inicio.strftime("%Y-%m-%d"), "fechahasta": fecha_fin.strftime("%Y-%m-%d")}
-    r = requests.get(url, params=params, verify=False)
-    data = r.json()["results"]
-    registros = [{"fecha": d["fecha"], "usd_oficial": cot["tipoCotizacion"]}
-                 for d in data for cot in d["detalle"] if isinstance(cot["tipoCotizacion"], (int, float))]
-    df = pd.DataFrame(registros)
-    df["fecha"] = pd.to_datetime(df["fecha"])
-    return df.groupby("fecha").mean().reset_index()
-
-def get_usd_blue():
-    r = requests.get("https://api.bluelytics.com.ar/v2/evolution.json")
-    data = [d for d in r.json() if d["source"] == "Blue"]
-    df = pd.DataFrame(data)
-    df["fecha"] = pd.to_datetime(df["date"])
-    df["usd_blue"] = (df["value_buy"] + df["value_sell"]) / 2
-    return df[["fecha", "usd_blue"]]
-
-def get_merval_usd():
-    merval = yf.download("^MERV", start=fecha_inicio, end=fecha_fin)["Close"].reset_index()
-    merval = merval.rename(columns={"Date": "fecha", "Close": "merval_ars"})
-    df_blue = get_usd_blue()
-    df = pd.merge(merval, df_blue, on="fecha", how="inner")
-    df["merval_usd"] = df["merval_ars"] / df["usd_blue"]
-    return df[["fecha", "merval_usd"]]
+@st.cache_data(ttl=300, show_spinner=False)
+def cargar_panel(series, desde, hasta):
+    # Un solo panel por día hábil para todas las series elegidas; cada serie sale
+    # del almacén local, así agregar una variable solo descarga esa
+    return get_indicadores(list(series), desde, hasta)
 
 # ============ PREPARAR LISTADO VARIABLES ============
-bcra_vars = get_bcra_vars()
-if bcra_vars is None:
+try:
+    catalogo = get_catalogo()
+except Exception:
     st.error("No se pudo obtener el listado de variables del BCRA.")
     st.stop()
 
-ids_interes = [1, 15, 6, 27]
-bcra_vars = bcra_vars[bcra_vars["idVariable"].isin(ids_interes)].copy()
-manual_vars = pd.DataFrame([
-    {"idVariable": "usd_oficial", "descripcion": "Dólar Oficial"},
-    {"idVariable": "usd_blue", "descripcion": "Dólar Blue"},
-    {"idVariable": "merval_usd", "descripcion": "Merval en USD"},
-])
-var_opciones = pd.concat([bcra_vars[["idVariable", "descripcion"]], manual_vars], ignore_index=True)
+# descripción -> serie de get_indicadores (id BCRA o nombre de indicador)
+var_opciones = {
+    "Dólar Oficial": "usd_oficial",
+    "Dólar Blue": "usd_blue",
+    "Brecha cambiaria (%)": "brecha_cambiaria",
+    "Yuan Oficial": "cny_oficial",
+    "Merval (ARS)": "merval_ars",
+    "Merval en USD": "merval_usd",
+    "Base monetaria en USD": "base_usd",
+    "Cobertura de la base con reservas (%)": "cobertura_reservas",
+}
+var_opciones.update({descripcion: catalogo.id_de(descripcion) for descripcion in catalogo.descripciones})
+por_defecto = [catalogo.descripcion(i) for i in (1, 15) if i in catalogo.por_id] + ["Dólar Oficial", "Dólar Blue"]
+
+# ============ SELECCIÓN ============
+seleccion = st.multiselect("Elegí las variables a comparar", list(var_opciones), default=por_defecto)
+if len(seleccion) < 2:
+    st.info("Elegí al menos dos variables.")
+    st.stop()
 
-# ============ SELECTBOXES ============
 col1, col2 = st.columns(2)
-var1 = col1.selectbox("Elegí la primera variable", var_opciones["descripcion"])
-var2 = col2.selectbox("Elegí la segunda variable", var_opciones["descripcion"], index=1)
+transformacion = col1.radio(
+    "Correlacionar", ["niveles", "variaciones"], horizontal=True,
+    format_func={"niveles": "Niveles", "variaciones": "Variaciones % diarias"}.get
+)
+max_rezago = col2.slider("Rezago máximo (días hábiles)", min_value=1, max_value=120, value=30)
 
 # ============ CARGAR DATOS ============
-def cargar_variable(id_variable):
-    if id_variable == "usd_oficial":
-        return get_usd_oficial().rename(columns={"usd_oficial": id_variable})
-    elif id_variable == "usd_blue":
-        return get_usd_blue().rename(columns={"usd_blue": id_variable})
-    elif id_variable == "merval_usd":
-        return get_merval_usd().rename(columns={"merval_usd": id_variable})
-    else:
-        return get_bcra_variable(id_variable)
-
-id1 = var_opciones[var_opciones["descripcion"] == var1].iloc[0]["idVariable"]
-id2 = var_opciones[var_opciones["descripcion"] == var2].iloc[0]["idVariable"]
-df1 = cargar_variable(id1)
-df2 = cargar_variable(id2)
-
-df = pd.merge(df1, df2, on="fecha", how="inner").dropna()
+try:
+    with st.spinner("Descargando series..."):
+        panel = cargar_panel(
+            tuple(var_opciones[v] for v in seleccion),
+            fecha_inicio.strftime("%Y-%m-%d"), fecha_fin.strftime("%Y-%m-%d")
+        )
+except Exception as e:
+    st.error(f"No se pudieron cargar las series: {e}")
+    st.stop()
+if panel.empty:
+    st.info("No hay datos para el período elegido (¿solo fines de semana o feriados?).")
+    st.stop()
+panel.columns = seleccion
 
-# ============ GRAFICAR ============
-fig = go.Figure()
-
-fig.add_trace(go.Scatter(x=df["fecha"], y=df[df.columns[1]],
-                         name=var1, yaxis="y1", mode="lines"))
-
-fig.add_trace(go.Scatter(x=df["fecha"], y=df[df.columns[2]],
-                         name=var2, yaxis="y2", mode="lines"))
-
-fig.update_layout(
-    title=f"Comparación: {var1} vs {var2}",
-    xaxis=dict(title="Fecha"),
-    yaxis=dict(title=var1, titlefont=dict(color="blue"), tickfont=dict(color="blue")),
-    yaxis2=dict(title=var2, titlefont=dict(color="red"), tickfont=dict(color="red"),
-                overlaying="y", side="right"),
-    legend=dict(x=0.01, y=0.99),
-    height=600
-)
+# ============ CÁLCULOS ============
+# Correlaciones, correlaciones cruzadas y base 100 salen del panel completo en
+# una pasada vectorizada, sin recorrer pares de series
+analisis = transformar(panel, transformacion)
+matriz = correlaciones(analisis)
+referencia = st.selectbox("Serie de referencia para la correlación cruzada", seleccion)
+cruzadas = correlaciones_cruzadas(analisis, referencia, max_rezago)
+normalizado = normalizar(panel)
 
-st.plotly_chart(fig, use_container_width=True)
+# ============ GRAFICAR ============
+tab1, tab2, tab3 = st.tabs(["Evolución (base 100)", "Correlaciones", "Correlación cruzada"])
+
+with tab1:
+    fig = go.Figure()
+    for nombre in seleccion:
+        fig.add_trace(trazo(x=normalizado.index, y=normalizado[nombre], name=nombre,
+                            mode="lines", connectgaps=True))
+    fig.update_layout(
+        title="Series normalizadas (base 100 = primer dato del período)",
+        xaxis=dict(title="Fecha"),
+        yaxis=dict(title="Base 100"),
+        legend=dict(orientation="h", yanchor="bottom", y=-0.35, xanchor="center", x=0.5),
+        hovermode="x unified",
+        height=600
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+with tab2:
+    fig = go.Figure(go.Heatmap(
+        z=matriz.to_numpy(), x=seleccion, y=seleccion, zmin=-1, zmax=1,
+        colorscale="RdBu", text=matriz.round(2).to_numpy(), texttemplate="%{text}"
+    ))
+    fig.update_layout(title=f"Correlación de Pearson ({transformacion})", height=600)
+    st.plotly_chart(fig, use_container_width=True)
+
+with tab3:
+    fig = go.Figure()
+    for nombre in seleccion:
+        if nombre != referencia:
+            fig.add_trace(trazo(x=cruzadas.index, y=cruzadas[nombre], name=nombre, mode="lines"))
+    fig.update_layout(
+        title=f"Correlación con {referencia} desplazada",
+        xaxis=dict(title="Rezago en días hábiles (positivo: la referencia se anticipa)"),
+        yaxis=dict(title="Correlación", range=[-1, 1]),
+        legend=dict(orientation="h", yanchor="bottom", y=-0.35, xanchor="center", x=0.5),
+        height=600
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    # Rezago de máxima correlación absoluta por serie
+    otras = [nombre for nombre in seleccion if nombre != referencia]
+    mejores = cruzadas[otras].abs().fillna(-1).idxmax()
+    st.dataframe(pd.DataFrame({
+        "serie": otras,
+        "rezago": mejores.to_numpy(),
+        "correlación": [cruzadas.at[rezago, nombre] for nombre, rezago in mejores.items()],
+    }), hide_index=True)
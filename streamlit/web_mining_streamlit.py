@@ -10,6 +10,18 @@ Original file is located at
 Nota:  Se monta el drive para guardar los gráficos
 """
 import streamlit as st
+import sys
+from pathlib import Path
+
+# Módulos compartidos de la raíz del repositorio
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from plotting import trazo
+from data_fetching import (
+    get_bcra_variable, get_cedears, get_cny_oficial, get_indicadores,
+    get_merval_ars, get_usd_blue, get_usd_oficial
+)
+from catalogo import get_catalogo
+import rollups
 
 st.title("Análisis de Datos Financieros Argentinos")
 st.header("Respaldo y Presión Cambiaria")
@@ -30,14 +42,10 @@ os.makedirs(output_folder, exist_ok=True)
 #### **Configuración inicial: librerías y parámetros**
 """
 
-import requests
 import pandas as pd
 import plotly.graph_objects as go
-import yfinance as yf
 from datetime import datetime
 from autoviz.AutoViz_Class import AutoViz_Class
-#!pip install yfinance --quiet
-import yfinance as yf
 import plotly.graph_objects as go
 
 # Parámetros de fecha
@@ -51,104 +59,28 @@ fecha_fin = st.date_input("Fecha de fin", datetime.today())
 
 """#### **Funciones reutilizables**"""
 
-def get_bcra_variable(id_variable, fecha_inicio, fecha_fin):
-    url = f"https://api.bcra.gob.ar/estadisticas/v3.0/monetarias/{id_variable}"
-    params = {"desde": fecha_inicio, "hasta": fecha_fin, "limit": 3000}
-    r = requests.get(url, params=params, verify=False)
-    if r.status_code == 200:
-        df = pd.DataFrame(r.json()["results"])
-        df["fecha"] = pd.to_datetime(df["fecha"])
-        return df[["fecha", "valor"]]
-    else:
-        raise Exception(f"Error al obtener variable {id_variable}")
+# get_bcra_variable, get_usd_oficial, get_usd_blue, get_cny_oficial,
+# get_merval_ars y get_cedears vienen de data_fetching: leen del almacén local
+# (series_store) y solo piden a las APIs las fechas que faltan
 
 def get_variable_name(id_variable):
-    url = "https://api.bcra.gob.ar/estadisticas/v3.0/monetarias"
-    r = requests.get(url, verify=False)
-    if r.status_code == 200:
-        df = pd.DataFrame(r.json()["results"])
-        return df[df["idVariable"] == id_variable]["descripcion"].values[0]
-    return f"Variable {id_variable}"
-
-def get_usd_oficial(fecha_inicio, fecha_fin):
-    url = "https://api.bcra.gob.ar/estadisticascambiarias/v1.0/Cotizaciones/USD"
-    params = {"fechadesde": fecha_inicio, "fechahasta": fecha_fin, "limit": 1000}
-    r = requests.get(url, params=params, verify=False)
-    data = r.json()["results"]
-    registros = []
-    for d in data:
-        fecha = d["fecha"]
-        for cot in d["detalle"]:
-            registros.append({"fecha": fecha, "usd_oficial": cot["tipoCotizacion"]})
-    df = pd.DataFrame(registros)
-    df["fecha"] = pd.to_datetime(df["fecha"])
-    return df.groupby("fecha").mean().reset_index()
-
-def get_usd_blue():
-    url = "https://api.bluelytics.com.ar/v2/evolution.json"
-    r = requests.get(url)
-    data = r.json()
-
-    # Filtrar solo entradas del tipo Blue
-    blue_data = [entry for entry in data if entry["source"] == "Blue"]
-
-    # Crear DataFrame
-    df = pd.DataFrame(blue_data)
-
-    # Convertir fechas
-    df["fecha"] = pd.to_datetime(df["date"])
-
-    # Promedio entre compra y venta
-    df["usd_blue"] = (df["value_buy"] + df["value_sell"]) / 2
-
-    return df[["fecha", "usd_blue"]]
-
-
-def get_cny_oficial(fecha_inicio, fecha_fin):
-    url = "https://api.bcra.gob.ar/estadisticascambiarias/v1.0/Cotizaciones/CNY"
-    params = {"fechadesde": fecha_inicio, "fechahasta": fecha_fin, "limit": 1000}
-    r = requests.get(url, params=params, verify=False)
-    if r.status_code == 200:
-        data = r.json()["results"]
-        registros = []
-        for d in data:
-            fecha = d["fecha"]
-            for cot in d["detalle"]:
-                registros.append({"fecha": fecha, "cny_oficial": cot["tipoCotizacion"]})
-        df = pd.DataFrame(registros)
-        df["fecha"] = pd.to_datetime(df["fecha"])
-        return df.groupby("fecha").mean().reset_index()
-    else:
-        raise Exception("Error al obtener CNY Oficial")
-
-"""#### **Obtener y combinar las series**"""
+    try:
+        return get_catalogo().descripcion(id_variable)
+    except Exception:
+        return f"Variable {id_variable}"
 
-# IDs de las variables BCRA
-id_base_monetaria = 15    # Base monetaria
-id_reservas = 1          # Reservas internacionales
 
-# Descargar variables BCRA
-df_base = get_bcra_variable(id_base_monetaria, fecha_inicio, fecha_fin).rename(columns={"valor": "base_monetaria"})
-df_reservas = get_bcra_variable(id_reservas, fecha_inicio, fecha_fin).rename(columns={"valor": "reservas"})
+"""#### **Obtener y combinar las series**"""
 
-# Dólares
-df_usd_oficial = get_usd_oficial(fecha_inicio, fecha_fin)
-df_usd_blue = get_usd_blue()
+# Descargar variables BCRA, dólares y yuan alineados por fecha, junto con la
+# base monetaria en USD (base_usd = base_monetaria / usd_oficial, ver indicadores.py)
+df = get_indicadores(
+    ["base_monetaria", "reservas", "usd_oficial", "usd_blue", "cny_oficial", "base_usd"],
+    fecha_inicio.strftime("%Y-%m-%d"), fecha_fin.strftime("%Y-%m-%d")
+).reset_index()
 
 # Yuan
-df_cny = get_cny_oficial(fecha_inicio, fecha_fin)
-
-# Unir todas las series
-df = pd.merge(df_base, df_reservas, on="fecha", how="outer")
-df = pd.merge(df, df_usd_oficial, on="fecha", how="outer")
-df = pd.merge(df, df_usd_blue, on="fecha", how="outer")
-df = pd.merge(df, df_cny, on="fecha", how="outer")
-
-# Ordenar por fecha
-df = df.sort_values("fecha").reset_index(drop=True)
-
-# Base monetaria en USD
-df["base_usd"] = df["base_monetaria"] / df["usd_oficial"]
+df_cny = df[["fecha", "cny_oficial"]].dropna()
 
 df.tail()
 
@@ -170,19 +102,19 @@ fig = go.Figure()
 
 
 # Trazas
-fig.add_trace(go.Scatter(x=df["fecha"], y=df["base_usd"],
+fig.add_trace(trazo(x=df["fecha"], y=df["base_usd"],
                          name="Base monetaria en USD",
                          mode="lines", line=dict(color="royalblue")))
 
-fig.add_trace(go.Scatter(x=df["fecha"], y=df["reservas"],
+fig.add_trace(trazo(x=df["fecha"], y=df["reservas"],
                          name="Reservas netas internacionales",
                          mode="lines", line=dict(color="firebrick")))
 
-fig.add_trace(go.Scatter(x=df["fecha"], y=df["usd_blue"],
+fig.add_trace(trazo(x=df["fecha"], y=df["usd_blue"],
                          name="Tipo de cambio paralelo (Blue)",
                          mode="lines", yaxis="y2", line=dict(color="seagreen")))
 
-fig.add_trace(go.Scatter(x=df["fecha"], y=df["usd_oficial"],
+fig.add_trace(trazo(x=df["fecha"], y=df["usd_oficial"],
                          name="Tipo de cambio oficial",
                          mode="lines", yaxis="y2",
                          line=dict(color="mediumseagreen", dash="dot")))
@@ -246,15 +178,8 @@ st.plotly_chart(fig)
 #### **Unir con tipo de cambio paralelo (blue) y calcular Merval en USD**
 """
 
-# Descargar Merval (^MERV)
-merval = yf.download("^MERV", start="2024-01-01")
-
-# Extraer la columna 'Close'
-merval_close = merval.xs("Close", axis=1, level="Price")
-
-# Renombrar y preparar
-merval = merval_close.rename(columns={"^MERV": "merval_ars"}).reset_index()
-merval = merval.rename(columns={"Date": "fecha"})  # ✅ renombrar fecha
+# Merval (^MERV): columnas fecha y merval_ars
+merval = get_merval_ars("2024-01-01", datetime.today().strftime("%Y-%m-%d"))
 
 # Tipo de cambio blue (asegurar unicidad)
 df_usd_blue_unique = df[["fecha", "usd_blue"]].dropna().drop_duplicates()
@@ -267,7 +192,7 @@ df_merval["merval_usd"] = df_merval["merval_ars"] / df_merval["usd_blue"]
 
 fig3 = go.Figure()
 
-fig3.add_trace(go.Scatter(
+fig3.add_trace(trazo(
     x=df_merval["fecha"],
     y=df_merval["merval_usd"],
     mode="lines",
@@ -328,7 +253,7 @@ ultimo_mes = df_inflacion["fecha"].dt.strftime("%B %Y").iloc[-1]
 fig_inflacion = go.Figure()
 
 # Línea suavizada con área rellena
-fig_inflacion.add_trace(go.Scatter(
+fig_inflacion.add_trace(trazo(
     x=df_inflacion["fecha"],
     y=df_inflacion["inflacion_mensual"],
     fill="tozeroy",
@@ -393,11 +318,8 @@ df_tasa = df_tasa.rename(columns={"valor": "tasa_monetaria"})
 df_tasa["fecha"] = pd.to_datetime(df_tasa["fecha"])
 df_tasa = df_tasa.sort_values("fecha")
 
-# Agrupamos por mes y tomamos el último valor disponible
-df_tasa["mes"] = df_tasa["fecha"].dt.to_period("M")
-df_tasa_mensual = df_tasa.groupby("mes").last().reset_index()
-df_tasa_mensual["fecha"] = df_tasa_mensual["mes"].dt.to_timestamp()
-df_tasa_mensual.drop(columns="mes", inplace=True)
+# Último valor disponible de cada mes
+df_tasa_mensual = rollups.agregar(df_tasa, "M", ["tasa_monetaria"])[["fecha", "tasa_monetaria"]]
 
 ultimo_valor_tasa = df_tasa_mensual["tasa_monetaria"].iloc[-1]
 ultimo_mes_tasa = df_tasa_mensual["fecha"].dt.strftime("%B %Y").iloc[-1]
@@ -409,7 +331,7 @@ max_y = (df_tasa["tasa_monetaria"].max()) * 1.05
 
 fig_tasa = go.Figure()
 
-fig_tasa.add_trace(go.Scatter(
+fig_tasa.add_trace(trazo(
     x=df_tasa["fecha"],
     y=df_tasa["tasa_monetaria"],
     fill="tozeroy",
@@ -489,7 +411,7 @@ max_y = (df_reservas["reservas"].max() / 1000) * 1.05
 # Gráfico
 fig_reservas = go.Figure()
 
-fig_reservas.add_trace(go.Scatter(
+fig_reservas.add_trace(trazo(
     x=df_reservas["fecha"],
     y=df_reservas["reservas"] / 1000,  # Lo mostramos en miles de millones
     fill="tozeroy",
@@ -577,7 +499,7 @@ max_y = df_tc[["usd_oficial", "usd_blue"]].max().max() * 1.05
 fig_tc = go.Figure()
 
 # USD Oficial
-fig_tc.add_trace(go.Scatter(
+fig_tc.add_trace(trazo(
     x=df_tc["fecha"],
     y=df_tc["usd_oficial"],
     fill="tozeroy",
@@ -588,7 +510,7 @@ fig_tc.add_trace(go.Scatter(
 ))
 
 # USD Blue
-fig_tc.add_trace(go.Scatter(
+fig_tc.add_trace(trazo(
     x=df_tc["fecha"],
     y=df_tc["usd_blue"],
     mode="lines",
@@ -671,7 +593,7 @@ max_y = df_cny["cny_oficial"].max() * 1.05
 # Gráfico
 fig_cny = go.Figure()
 
-fig_cny.add_trace(go.Scatter(
+fig_cny.add_trace(trazo(
     x=df_cny["fecha"],
     y=df_cny["cny_oficial"],
     fill="tozeroy",
@@ -730,11 +652,8 @@ fig_cny.update_layout(
 
 fig_cny.show()
 
-# Descargar Merval (^MERV)
-merval = yf.download("^MERV", start="2024-08-01", end="2025-04-30")
-merval_close = merval.xs("Close", axis=1, level="Price")
-merval = merval_close.rename(columns={"^MERV": "merval_ars"}).reset_index()
-merval = merval.rename(columns={"Date": "fecha"})
+# Merval (^MERV)
+merval = get_merval_ars("2024-08-01", "2025-04-29")
 
 # USD Blue (ya lo habías traído antes, asegurate que esté filtrado bien)
 df_usd_blue = df_usd_blue[df_usd_blue["fecha"].between("2024-08-01", "2025-04-30")]
@@ -758,7 +677,7 @@ max_y = df_merval["merval_usd"].max() * 1.05
 # Gráfico
 fig_merval = go.Figure()
 
-fig_merval.add_trace(go.Scatter(
+fig_merval.add_trace(trazo(
     x=df_merval["fecha"],
     y=df_merval["merval_usd"],
     fill="tozeroy",
@@ -825,17 +744,8 @@ cedears = {
     "MELI.BA": "MercadoLibre"
 }
 
-# Descargar precios
-data = yf.download(list(cedears.keys()), start="2024-08-01", end="2025-04-30")["Close"]
-
-# Formateo
-df_cedears = data.reset_index()
-df_cedears = df_cedears.rename(columns={"Date": "fecha"})
-
-# Normalizar a 100
-for ticker in cedears.keys():
-    df_cedears[ticker] = (df_cedears[ticker] / df_cedears[ticker].iloc[0]) * 100
-
+# Precios normalizados a 100 (get_cedears ya los devuelve en base 100)
+df_cedears = get_cedears("2024-08-01", "2025-04-29", cedears)
 df_cedears = df_cedears.dropna().sort_values("fecha").reset_index(drop=True)
 
 # Crear ticks del eje X
@@ -847,7 +757,7 @@ fig_cedears = go.Figure()
 # Agregar una traza por Cedear
 colors = ["#FF5733", "#1E90FF", "#2ECC71", "#7FDBFF"]  # Paleta compatible
 for i, (ticker, name) in enumerate(cedears.items()):
-    fig_cedears.add_trace(go.Scatter(
+    fig_cedears.add_trace(trazo(
         x=df_cedears["fecha"],
         y=df_cedears[ticker],
         mode="lines",
@@ -902,25 +812,16 @@ fig_cedears.show()
 
 
 
-import requests
 import pandas as pd
 
-# Endpoint general de variables (últimos valores disponibles)
-url = "https://api.bcra.gob.ar/estadisticas/v3.0/monetarias"
-response = requests.get(url, verify=False)
-
-if response.status_code == 200:
-    variables = pd.DataFrame(response.json()["results"])
-
-else:
-    print("Error:", response.status_code, response.text)
+# Variables disponibles, del catálogo persistido (catalogo.py)
+variables = pd.DataFrame(get_catalogo().variables)
 
 # Variables disponibles
 variables
 
 variables.to_csv("variables.csv", index=False)
 
-import requests
 import pandas as pd
 import plotly.graph_objects as go
 
@@ -935,55 +836,22 @@ fecha_fin = "2025-03-25"
 # DESCARGAR SERIE DE TIEMPO
 
 
-url_data = f"https://api.bcra.gob.ar/estadisticas/v3.0/monetarias/{id_variable}"
-params = {"desde": fecha_inicio, "hasta": fecha_fin, "limit": 3000}
-r = requests.get(url_data, params=params, verify=False)
-
-if r.status_code == 200:
-    data = r.json()["results"]
-    df_v = pd.DataFrame(data)
-    df_v["fecha"] = pd.to_datetime(df_v["fecha"])
-    df_v = df_v[["fecha", "valor"]]
-else:
-    raise Exception("Error al obtener variables")
+df_v = get_bcra_variable(id_variable, fecha_inicio, fecha_fin)[["fecha", "valor"]]
 
 
 # OBTENER COTIZACIÓN USD
 
 
-url_usd = "https://api.bcra.gob.ar/estadisticascambiarias/v1.0/Cotizaciones/USD"
-params_usd = {
-    "fechadesde": fecha_inicio,
-    "fechahasta": fecha_fin,
-    "limit": 1000
-}
-r_usd = requests.get(url_usd, params=params_usd, verify=False)
-data_usd = r_usd.json()["results"]
-
-usd_registros = []
-for dia in data_usd:
-    fecha = dia["fecha"]
-    for cot in dia["detalle"]:
-        usd_registros.append({
-            "fecha": fecha,
-            "tipoCotizacion": cot["tipoCotizacion"]
-        })
-
-df_usd = pd.DataFrame(usd_registros)
-df_usd["fecha"] = pd.to_datetime(df_usd["fecha"])
-df_usd = df_usd.groupby("fecha").mean().reset_index()
+df_usd = get_usd_oficial(fecha_inicio, fecha_fin).rename(columns={"usd_oficial": "tipoCotizacion"})
 
 # =============================
 
 
 # Obtener el nombre de la variable desde la API (último valor disponible)
 # Para mostrarlo en el gráfico
-url_var_info = "https://api.bcra.gob.ar/estadisticas/v3.0/monetarias"
-res_info = requests.get(url_var_info, verify=False)
-if res_info.status_code == 200:
-    df_info = pd.DataFrame(res_info.json()["results"])
-    nombre_variable = df_info[df_info["idVariable"] == id_variable].iloc[0]["descripcion"]
-else:
+try:
+    nombre_variable = get_catalogo().descripcion(id_variable, f"Variable ID {id_variable}")
+except Exception:
     nombre_variable = f"Variable ID {id_variable}"  # fallback en caso de error
 
 # Renombrar columna de valor con el nombre de la variable
@@ -1002,7 +870,7 @@ fig = go.Figure()
 
 
 # Serie de la variable (ej. Reservas)
-fig.add_trace(go.Scatter(
+fig.add_trace(trazo(
     x=df["fecha"],
     y=df[nombre_variable],
     mode='lines',
@@ -1011,7 +879,7 @@ fig.add_trace(go.Scatter(
 ))
 
 # Serie del tipo de cambio USD
-fig.add_trace(go.Scatter(
+fig.add_trace(trazo(
     x=df["fecha"],
     y=df["tipoCotizacion"],
     mode='lines',
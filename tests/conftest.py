@@ -0,0 +1,7 @@
+# tests/conftest.py
+
+import sys
+from pathlib import Path
+
+# Módulos compartidos de la raíz del repositorio
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,51 @@
+# tests/test_calendario.py
+
+import datetime
+
+import pandas as pd
+import pytest
+
+import calendario
+
+
+@pytest.mark.parametrize("anio, domingo", [
+    (2019, datetime.date(2019, 4, 21)),
+    (2024, datetime.date(2024, 3, 31)),
+    (2025, datetime.date(2025, 4, 20)),
+    (2038, datetime.date(2038, 4, 25)),
+])
+def test_pascua(anio, domingo):
+    assert calendario.pascua(anio) == domingo
+
+
+def test_feriados_2024():
+    esperados = {datetime.date.fromisoformat(f) for f in [
+        "2024-01-01", "2024-02-12", "2024-02-13", "2024-03-24", "2024-03-28", "2024-03-29",
+        "2024-04-02", "2024-05-01", "2024-05-25", "2024-06-17", "2024-06-20", "2024-07-09",
+        "2024-08-17", "2024-10-12", "2024-11-18", "2024-12-08", "2024-12-25",
+    ]}
+    assert calendario.feriados(2024) == esperados
+
+
+def test_trasladables():
+    # Martes/miércoles al lunes anterior, jueves/viernes al lunes siguiente, fin de semana queda
+    assert calendario._trasladar(datetime.date(2024, 11, 20)) == datetime.date(2024, 11, 18)
+    assert calendario._trasladar(datetime.date(2025, 10, 12)) == datetime.date(2025, 10, 12)
+    assert calendario._trasladar(datetime.date(2026, 8, 20)) == datetime.date(2026, 8, 24)
+
+
+def test_dias_habiles_excluye_feriados_y_fines_de_semana():
+    habiles = calendario.dias_habiles("2024-03-25", "2024-04-05")
+    assert habiles.strftime("%Y-%m-%d").tolist() == [
+        "2024-03-25", "2024-03-26", "2024-03-27", "2024-04-01", "2024-04-03", "2024-04-04", "2024-04-05",
+    ]
+    assert not calendario.es_habil("2024-03-29")
+    assert calendario.es_habil("2024-04-01")
+
+
+def test_alinear_usa_el_ultimo_valor_conocido():
+    serie = pd.Series([10.0, 20.0], index=pd.to_datetime(["2024-03-22", "2024-04-03"]))
+    panel = calendario.alinear({"x": serie}, "2024-03-25", "2024-04-04", limite_dias=5)
+    assert panel["x"].tolist()[:3] == [10.0, 10.0, 10.0]
+    assert pd.isna(panel.loc["2024-04-01", "x"])  # más de 5 días desde el 22/3
+    assert panel.loc["2024-04-04", "x"] == 20.0
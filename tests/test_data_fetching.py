@@ -0,0 +1,77 @@
+# tests/test_data_fetching.py
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+from stub_server import StubServer
+
+import data_fetching
+import series_store
+
+
+@pytest.fixture
+def stub(tmp_path, monkeypatch):
+    servidor = StubServer()
+    url = servidor.start()
+    monkeypatch.setattr(data_fetching, "BCRA_API_URL", url)
+    monkeypatch.setattr(series_store, "STORE_DIR", str(tmp_path))
+    yield servidor
+    servidor.stop()
+
+
+@pytest.mark.parametrize("dias_por_tramo", [2500, 100000])
+def test_variable_larga_llega_completa(stub, monkeypatch, dias_por_tramo):
+    # Más de 3000 días hábiles: con tramos grandes se completa paginando con offset
+    monkeypatch.setattr(data_fetching, "BCRA_DIAS_POR_TRAMO", dias_por_tramo)
+    df = data_fetching.get_bcra_variable(1, "2012-01-01", "2024-12-31")
+    esperadas = pd.bdate_range("2012-01-01", "2024-12-31")
+    assert len(df) == len(esperadas)
+    assert df["fecha"].min() == esperadas[0]
+    assert series_store.rangos_faltantes("bcra_1", "2012-01-01", "2024-12-31", refresco=3600) == []
+
+
+@pytest.fixture
+def yahoo(tmp_path, monkeypatch):
+    # yf.download falso: cierres en cada día hábil; los tickers de `fallan`
+    # vuelven con la columna en NaN, como cuando yfinance no puede bajar uno
+    import yfinance
+
+    monkeypatch.setattr(series_store, "STORE_DIR", str(tmp_path))
+    fallan = set()
+
+    def download(tickers, start, end, **kwargs):
+        fechas = pd.bdate_range(start, pd.Timestamp(end) - pd.Timedelta(days=1))
+        cierres = pd.DataFrame(1.0, index=fechas, columns=pd.MultiIndex.from_product([["Close"], tickers]))
+        for ticker in fallan.intersection(tickers):
+            cierres[("Close", ticker)] = np.nan
+        return cierres
+
+    monkeypatch.setattr(yfinance, "download", download)
+    return fallan
+
+
+def test_ticker_sin_cierres_no_queda_cubierto(yahoo):
+    data_fetching._cierres_almacenados(["GGAL.BA", "YPFD.BA"], "2024-06-01", "2024-12-31")
+    yahoo.add("GGAL.BA")
+    df = data_fetching._cierres_almacenados(["GGAL.BA", "YPFD.BA"], "2023-01-01", "2024-12-31")
+    assert df.loc[:"2023-12-31", "GGAL.BA"].isna().all()
+    assert series_store.rangos_faltantes("yahoo_GGAL.BA", "2023-01-01", "2024-12-31", refresco=3600) == [
+        ("2023-01-01", "2024-05-31")
+    ]
+    assert series_store.rangos_faltantes("yahoo_YPFD.BA", "2023-01-01", "2024-12-31", refresco=3600) == []
+
+    yahoo.clear()
+    df = data_fetching._cierres_almacenados(["GGAL.BA", "YPFD.BA"], "2023-01-01", "2024-12-31")
+    assert df["GGAL.BA"].notna().all()
+
+
+def test_todos_los_tickers_sin_cierres_es_error(yahoo):
+    yahoo.add("GGAL.BA")
+    with pytest.raises(Exception, match="GGAL.BA"):
+        data_fetching._cierres_almacenados(["GGAL.BA"], "2024-06-01", "2024-12-31")
+    assert series_store.cobertura("yahoo_GGAL.BA") is None
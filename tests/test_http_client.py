@@ -0,0 +1,98 @@
+# tests/test_http_client.py
+
+import asyncio
+
+import pytest
+
+import http_client
+
+
+def _limite(concurrencia=4, concurrencia_max=8, tasa=0, rafaga=10):
+    return http_client.LimiteHost(tasa, rafaga=rafaga, concurrencia=concurrencia, concurrencia_max=concurrencia_max)
+
+
+def test_429_reduce_la_concurrencia_a_la_mitad():
+    limite = _limite(concurrencia=8)
+    enviado = limite.entrar()
+    limite.salir(enviado, 429)
+    assert limite.estado()["concurrencia"] == 4
+    assert limite.estado()["limitados"] == 1
+
+
+def test_una_sola_reduccion_por_tanda():
+    # Los pedidos enviados antes del recorte no vuelven a recortar
+    limite = _limite(concurrencia=8)
+    enviados = [limite.entrar() for _ in range(3)]
+    for enviado in enviados:
+        limite.salir(enviado, 503)
+    assert limite.estado()["concurrencia"] == 4
+    assert limite.estado()["limitados"] == 3
+    limite.salir(limite.entrar(), 429)
+    assert limite.estado()["concurrencia"] == 2
+
+
+def test_la_concurrencia_no_baja_de_uno():
+    limite = _limite(concurrencia=2)
+    for _ in range(4):
+        limite.salir(limite.entrar(), 429)
+    assert limite.estado()["concurrencia"] == 1
+
+
+def test_crece_de_a_uno_por_ventana_llena():
+    # Cada respuesta con el cupo lleno suma 1/concurrencia
+    limite = _limite(concurrencia=2, concurrencia_max=3)
+    for _ in range(3):
+        enviados = [limite.entrar() for _ in range(2)]
+        for enviado in enviados:
+            limite.salir(enviado, 200)
+    assert limite.estado()["concurrencia"] == 3
+    for _ in range(10):
+        enviados = [limite.entrar() for _ in range(3)]
+        for enviado in enviados:
+            limite.salir(enviado, 200)
+    assert limite.estado()["concurrencia"] == 3
+
+
+def test_no_crece_si_no_se_usa_el_cupo():
+    limite = _limite(concurrencia=4)
+    for _ in range(50):
+        limite.salir(limite.entrar(), 200)
+    assert limite.estado()["concurrencia"] == 4
+
+
+def test_errores_sin_limitacion_no_cambian_la_concurrencia():
+    limite = _limite(concurrencia=1)
+    limite.salir(limite.entrar(), 500)
+    limite.salir(limite.entrar())
+    assert limite.estado()["concurrencia"] == 1
+    assert limite.estado()["en_vuelo"] == 0
+
+
+def test_retry_after_pausa_al_host():
+    limite = _limite()
+    limite.salir(limite.entrar(), 429, retry_after=30)
+    assert limite.estado()["pausa_s"] == pytest.approx(30, abs=0.2)
+    assert limite._reservar() == pytest.approx(30, abs=0.2)
+
+
+def test_token_bucket_respeta_la_rafaga():
+    limite = _limite(tasa=10, rafaga=2)
+    assert limite._reservar() == 0
+    assert limite._reservar() == 0
+    assert limite._reservar() == pytest.approx(0.1, abs=0.02)
+    assert limite._reservar() == pytest.approx(0.2, abs=0.02)
+
+
+def test_entrar_async_devuelve_el_cupo():
+    limite = _limite(concurrencia=1)
+
+    async def pedido():
+        enviado = await limite.entrar_async()
+        await asyncio.sleep(0.01)
+        limite.salir(enviado, 200)
+
+    async def varios():
+        await asyncio.gather(*(pedido() for _ in range(5)))
+
+    asyncio.run(varios())
+    assert limite.estado()["en_vuelo"] == 0
@@ -0,0 +1,58 @@
+# tests/test_rollups.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import rollups
+import series_store
+
+
+@pytest.fixture(autouse=True)
+def almacen(tmp_path, monkeypatch):
+    monkeypatch.setattr(series_store, "STORE_DIR", str(tmp_path))
+    rollups.invalidar()
+
+
+def _serie(desde="2019-01-01", hasta="2024-12-31"):
+    fechas = pd.bdate_range(desde, hasta)
+    return pd.DataFrame({"fecha": fechas, "valor": np.arange(len(fechas), dtype=float)})
+
+
+def test_extension_hacia_adelante_es_incremental():
+    df = _serie()
+    rollups.get_rollup("s", df[df["fecha"] <= "2024-06-15"], "M")
+    assert rollups.get_rollup("s", df, "M").equals(rollups.agregar(df, "M"))
+
+
+def test_hueco_interior_completado_recalcula():
+    df = _serie()
+    hueco = df[(df["fecha"] < "2022-03-01") | (df["fecha"] > "2022-03-31")]
+    rollups.get_rollup("s", hueco[hueco["fecha"] <= "2024-06-30"], "M")
+    resultado = rollups.get_rollup("s", df, "M")
+    assert len(resultado) == 72
+    assert resultado.equals(rollups.agregar(df, "M"))
+
+
+def test_valor_revisado_recalcula():
+    df = _serie()
+    rollups.get_rollup("s", df, "W")
+    revisado = df.copy()
+    revisado.loc[10, "valor"] = -5.0
+    assert rollups.get_rollup("s", revisado, "W").equals(rollups.agregar(revisado, "W"))
+
+
+@pytest.mark.parametrize("frecuencia", ["W", "M", "Q"])
+def test_agregado_almacenado_igual_al_del_rango(frecuencia):
+    df = _serie()
+    series_store.guardar("s", df, "2019-01-01", "2024-12-31")
+    rollups.actualizar("s")
+    rango = df[df["fecha"].between("2020-01-15", "2024-11-20")].reset_index(drop=True)
+    assert rollups.agregado_almacenado("s", rango, frecuencia).equals(rollups.agregar(rango, frecuencia))
+
+
+def test_agregado_almacenado_distinto_del_almacen():
+    df = _serie()
+    series_store.guardar("s", df, "2019-01-01", "2024-12-31")
+    otro = df.assign(valor=df["valor"] + 1)
+    assert rollups.agregado_almacenado("s", otro, "M") is None
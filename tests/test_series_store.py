@@ -0,0 +1,74 @@
+# tests/test_series_store.py
+
+import pandas as pd
+import pytest
+
+import series_store
+
+
+@pytest.fixture(autouse=True)
+def almacen(tmp_path, monkeypatch):
+    monkeypatch.setattr(series_store, "STORE_DIR", str(tmp_path))
+
+
+def _frame(fechas, valor=1.0):
+    return pd.DataFrame({"fecha": pd.to_datetime(fechas), "valor": valor})
+
+
+def test_serie_nueva_pide_todo_el_rango():
+    assert series_store.rangos_faltantes("s", "2024-01-01", "2024-03-31") == [("2024-01-01", "2024-03-31")]
+
+
+def test_rango_cubierto_y_vigente_no_pide_nada():
+    series_store.guardar("s", _frame(["2024-01-02", "2024-03-28"]), "2024-01-01", "2024-03-31")
+    assert series_store.rangos_faltantes("s", "2024-02-01", "2024-03-31", refresco=3600) == []
+
+
+def test_inicio_anterior_pide_el_tramo_contiguo():
+    series_store.guardar("s", _frame(["2024-01-02", "2024-03-28"]), "2024-01-01", "2024-03-31")
+    faltantes = series_store.rangos_faltantes("s", "2023-06-01", "2024-03-31", refresco=3600)
+    assert faltantes == [("2023-06-01", "2023-12-31")]
+
+
+def test_cola_vuelve_a_pedir_los_ultimos_dias_almacenados(monkeypatch):
+    monkeypatch.setattr(series_store, "REVISION_DIAS", 7)
+    series_store.guardar("s", _frame(["2024-01-02", "2024-03-28"]), "2024-01-01", "2024-03-31")
+    faltantes = series_store.rangos_faltantes("s", "2024-01-01", "2024-04-30", refresco=3600)
+    assert faltantes == [("2024-03-21", "2024-04-30")]
+
+
+def test_cola_vencida_se_reverifica(monkeypatch):
+    monkeypatch.setattr(series_store, "REVISION_DIAS", 0)
+    series_store.guardar("s", _frame(["2024-01-02", "2024-03-28"]), "2024-01-01", "2024-03-31")
+    assert series_store.rangos_faltantes("s", "2024-01-01", "2024-03-31", refresco=0) == [("2024-03-28", "2024-03-31")]
+
+
+def test_revision_no_pasa_del_inicio_de_la_cobertura(monkeypatch):
+    monkeypatch.setattr(series_store, "REVISION_DIAS", 30)
+    series_store.guardar("s", _frame(["2024-03-26", "2024-03-28"]), "2024-03-25", "2024-03-31")
+    assert series_store.rangos_faltantes("s", "2024-03-25", "2024-03-31", refresco=0) == [("2024-03-25", "2024-03-31")]
+
+
+def test_valor_provisorio_se_corrige_en_la_revision(monkeypatch):
+    monkeypatch.setattr(series_store, "REVISION_DIAS", 7)
+    series_store.guardar("s", _frame(["2024-03-25", "2024-03-26", "2024-03-28"], 1.0), "2024-03-01", "2024-03-31")
+    for desde, hasta in series_store.rangos_faltantes("s", "2024-03-01", "2024-03-31", refresco=0):
+        series_store.guardar("s", _frame(["2024-03-25", "2024-03-26", "2024-03-28"], 2.0), desde, hasta)
+    assert series_store.leer("s")["valor"].tolist() == [2.0, 2.0, 2.0]
+
+
+def test_completar_el_principio_no_cuenta_como_verificar_la_cola():
+    series_store.guardar("s", _frame(["2024-03-28"]), "2024-03-01", "2024-03-31")
+    verificado = series_store.cobertura("s")["verificado"]
+    series_store.guardar("s", _frame(["2024-02-01"]), "2024-02-01", "2024-02-29")
+    cobertura = series_store.cobertura("s")
+    assert cobertura["verificado"] == verificado
+    assert (cobertura["desde"], cobertura["consultado_hasta"]) == ("2024-02-01", "2024-03-31")
+
+
+def test_guardar_reemplaza_valores_y_leer_ordena():
+    series_store.guardar("s", _frame(["2024-01-03", "2024-01-02"], 1.0), "2024-01-01", "2024-01-03")
+    series_store.guardar("s", _frame(["2024-01-03"], 5.0), "2024-01-03", "2024-01-03")
+    df = series_store.leer("s")
+    assert df["fecha"].dt.strftime("%Y-%m-%d").tolist() == ["2024-01-02", "2024-01-03"]
+    assert df["valor"].tolist() == [1.0, 5.0]